@@ -8,6 +8,7 @@ import keyword_generator
 import title_optimiser
 import description_writer
 import thumbnail_helper
+import bulk_generator
 
 # Set page layout early
 st.set_page_config(page_title="Creator Toolkit", layout="wide")
@@ -36,6 +37,7 @@ pages = {
     "✍️ Title Optimiser": "title",
     "📝 Description Writer": "description",
     "🎨 Thumbnail Helper": "thumb",
+    "📦 Bulk Copy Generator": "bulk",
 }
 
 default_page = list(pages.keys())[0]
@@ -44,12 +46,8 @@ default_page = list(pages.keys())[0]
 if 'page' not in st.session_state:
     st.session_state.page = default_page
 
-nav = st.sidebar.radio("Choose a tool:", list(pages.keys()), index=list(pages.keys()).index(st.session_state.page))
-
-# If nav changed, update and rerun
-if nav != st.session_state.page:
-    st.session_state.page = nav
-    st.rerun()
+# Keyed to session state, so the choice is already applied on the run the click triggers
+st.sidebar.radio("Choose a tool:", list(pages.keys()), key="page")
 
 # Routing logic
 if st.session_state.page == "🏠 Home":
@@ -80,3 +78,6 @@ elif st.session_state.page == "🎨 Thumbnail Helper":
 
 elif st.session_state.page == "🔑 Keyword / Phrase Generator":
     keyword_generator.run()
+
+elif st.session_state.page == "📦 Bulk Copy Generator":
+    bulk_generator.run()
@@ -0,0 +1,205 @@
+import streamlit as st
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import random
+import time
+import pandas as pd
+from openai import AsyncOpenAI, RateLimitError, APIStatusError, APIConnectionError
+
+from title_optimiser import title_messages, parse_titles, score_title
+from description_writer import description_messages
+from thumbnail_helper import thumbnail_messages, parse_concepts
+
+# Finished rows are appended here, one CSV per input file, and double as the resume checkpoint
+BULK_RUNS_DIR = os.environ.get("CREATOR_TOOLKIT_BULK_DIR", "bulk_runs")
+OUTPUT_FIELDS = ["row", "title", "topic", "keyword", "tone", "titles", "description", "thumbnail_concepts", "error"]
+MAX_ATTEMPTS = 5
+
+
+def read_backlog(data):
+    """Parse uploaded CSV bytes into row dicts with title/topic/keyword/tone keys."""
+    df = pd.read_csv(io.BytesIO(data), dtype=str).fillna("")
+    df.columns = [c.strip().lower() for c in df.columns]
+    missing = {"title", "keyword"} - set(df.columns)
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    for column in ("topic", "tone"):
+        if column not in df.columns:
+            df[column] = ""
+    return [
+        {"row": i, "title": r["title"].strip(), "topic": r["topic"].strip(), "keyword": r["keyword"].strip(), "tone": r["tone"].strip() or "Neutral"}
+        for i, r in df.iterrows()
+    ]
+
+
+def checkpoint_path(data):
+    os.makedirs(BULK_RUNS_DIR, exist_ok=True)
+    return os.path.join(BULK_RUNS_DIR, f"{hashlib.sha1(data).hexdigest()[:12]}.csv")
+
+
+def completed_rows(path):
+    """Row numbers already written to the output CSV by an earlier (possibly crashed) run."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="", encoding="utf-8") as f:
+        return {int(r["row"]) for r in csv.DictReader(f) if r.get("row", "").isdigit() and not r.get("error")}
+
+
+def final_results(path):
+    """Output rows with retried failures collapsed to their latest successful attempt, in backlog order."""
+    df = pd.read_csv(path, dtype=str).fillna("")
+    df = df.sort_values("error", key=lambda c: c != "", kind="stable").drop_duplicates("row", keep="first")
+    return df.sort_values("row", key=lambda c: c.astype(int))
+
+
+async def complete(client, limiter, messages, temperature, max_tokens):
+    """One chat completion under the shared concurrency limit, backing off together on 429s.
+
+    limiter holds the semaphore and a shared 'paused until' time, so when one call is
+    rate-limited every worker waits instead of all of them hammering the API.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        wait = limiter["paused_until"] - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        # Backoffs are slept outside the semaphore so a failing call doesn't hold a slot while it waits
+        backoff = 0
+        async with limiter["semaphore"]:
+            try:
+                response = await client.chat.completions.create(
+                    model="gpt-4",
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                return response.choices[0].message.content.strip()
+            except RateLimitError as e:
+                retry_after = float(e.response.headers.get("retry-after") or 2 ** attempt)
+                limiter["paused_until"] = max(limiter["paused_until"], time.monotonic() + retry_after + random.uniform(0, 0.5))
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+            except (APIConnectionError, APIStatusError) as e:
+                if attempt == MAX_ATTEMPTS - 1 or getattr(e, "status_code", 500) < 500:
+                    raise
+                backoff = 2 ** attempt + random.uniform(0, 0.5)
+        if backoff:
+            await asyncio.sleep(backoff)
+
+
+async def gather_or_cancel(*coros):
+    """Like asyncio.gather, but the first failure cancels the calls still running and is re-raised."""
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    failed = next((task for task in tasks if task in done and task.exception()), None)
+    if failed:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise failed.exception()
+    return [task.result() for task in tasks]
+
+
+async def generate_row(client, limiter, row):
+    # Titles, description and thumbnail concepts only depend on the input row, so they run together;
+    # if one fails the row is written as failed, so the others are cancelled rather than spend quota
+    titles, description, concepts = await gather_or_cancel(
+        complete(client, limiter, title_messages(row["topic"], row["keyword"], row["tone"], "Balanced (CTR + SEO)"), 0.7, 800),
+        complete(client, limiter, description_messages(row["title"], row["keyword"], row["topic"], row["tone"], "Balanced"), 0.7, 800),
+        complete(client, limiter, thumbnail_messages(row["title"], row["keyword"], row["tone"], "Stand out from competition"), 0.8, 800),
+    )
+    ranked = sorted(parse_titles(titles), key=lambda t: score_title(t[0], row["keyword"]), reverse=True)
+    return {
+        **row,
+        "titles": " | ".join(title for title, _ in ranked),
+        "description": description,
+        "thumbnail_concepts": "\n\n".join(text for _, text, _ in parse_concepts(concepts)),
+        "error": "",
+    }
+
+
+async def run_backlog(api_key, rows, out_path, concurrency, on_row):
+    """Generate copy for rows through a bounded pool of workers, appending each finished row to out_path."""
+    client = AsyncOpenAI(api_key=api_key, max_retries=0)
+    limiter = {"semaphore": asyncio.Semaphore(concurrency), "paused_until": 0.0}
+    queue = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+
+    new_file = not os.path.exists(out_path)
+    with open(out_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        async def worker():
+            while not queue.empty():
+                row = queue.get_nowait()
+                try:
+                    result = await generate_row(client, limiter, row)
+                except Exception as e:
+                    result = {**row, "titles": "", "description": "", "thumbnail_concepts": "", "error": str(e)}
+                # Written and flushed per row so a crash loses at most the rows in flight
+                writer.writerow(result)
+                f.flush()
+                on_row(result)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await client.close()
+
+
+def run():
+    st.title("📦 Bulk Copy Generator")
+    st.markdown("""
+    Generate titles, descriptions and thumbnail concepts for a whole video backlog at once.
+
+    Upload a CSV with `title` and `keyword` columns (and optionally `topic` and `tone`), one planned video per row.
+    Finished rows are saved as they complete — if a run stops part-way, upload the same CSV again to pick up where it left off.
+    """)
+
+    uploaded = st.file_uploader("Video backlog CSV", type=["csv"])
+    concurrency = st.slider("Parallel requests", 1, 16, 4, help="Lower this if you keep hitting OpenAI rate limits.")
+
+    if not uploaded:
+        return
+
+    data = uploaded.getvalue()
+    try:
+        rows = read_backlog(data)
+    except Exception as e:
+        st.error(f"❌ Couldn't read CSV: {e}")
+        return
+
+    out_path = checkpoint_path(data)
+    done = completed_rows(out_path)
+    pending = [r for r in rows if r["row"] not in done]
+    st.info(f"{len(rows)} videos in backlog — {len(done)} already done, {len(pending)} to generate.")
+
+    if pending and st.button("🚀 Generate copy for backlog"):
+        progress = st.progress(len(done) / len(rows), text=f"{len(done)}/{len(rows)} videos")
+        latest = st.empty()
+        finished = []
+
+        def on_row(result):
+            finished.append(result)
+            count = len(done) + len(finished)
+            progress.progress(count / len(rows), text=f"{count}/{len(rows)} videos")
+            latest.dataframe(pd.DataFrame(finished[-10:])[["row", "title", "titles", "error"]], hide_index=True)
+
+        asyncio.run(run_backlog(st.secrets["api"]["openai_key"], pending, out_path, concurrency, on_row))
+        failed = [r for r in finished if r["error"]]
+        if failed:
+            st.warning(f"⚠️ {len(failed)} rows failed and will be retried next time you run this CSV.")
+        else:
+            st.success("✅ Backlog complete.")
+
+    if os.path.exists(out_path):
+        results = final_results(out_path)
+        st.download_button("💾 Download results CSV", results.to_csv(index=False), file_name=f"bulk_copy_{os.path.basename(out_path)}", mime="text/csv")
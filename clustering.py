@@ -0,0 +1,105 @@
+import re
+import zlib
+import numpy as np
+
+# MinHash signature length, split into LSH bands of NUM_PERM // LSH_BANDS rows each.
+# 32 bands of 2 rows give a pair at 0.5 Jaccard a 1-(1-0.5²)³² ≈ 99.99% chance of sharing a
+# bucket (98.7% at 0.3); the extra candidates this lets through are filtered by the full check.
+NUM_PERM = 64
+LSH_BANDS = 32
+SIMILARITY_THRESHOLD = 0.5
+# Buckets up to this size are confirmed pair by pair; bigger ones only against their first member
+MAX_PAIRWISE_BUCKET = 64
+# Documents hashed per NumPy block, keeping the (shingles x permutations) matrix small
+CHUNK_DOCS = 1000
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20250721)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.int64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.int64)
+
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = {"the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "with", "my", "your", "is", "this", "i"}
+
+
+def shingles(text):
+    """Word unigrams and bigrams, which catch reuploads and series episodes with shared wording."""
+    words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash_signatures(docs):
+    """(len(docs), NUM_PERM) MinHash signatures, hashed block-wise with NumPy broadcasting."""
+    signatures = []
+    for start in range(0, len(docs), CHUNK_DOCS):
+        hashes, offsets = [], []
+        for i, doc in enumerate(docs[start:start + CHUNK_DOCS], start):
+            # An empty document gets a unique token so it never looks like another empty one
+            tokens = shingles(doc) or {f"\0empty{i}"}
+            offsets.append(len(hashes))
+            hashes.extend(zlib.crc32(t.encode()) for t in tokens)
+        x = np.array(hashes, dtype=np.int64)
+        permuted = (x[:, None] * _A[None, :] + _B[None, :]) % _PRIME
+        signatures.append(np.minimum.reduceat(permuted, offsets, axis=0))
+    return np.vstack(signatures) if signatures else np.empty((0, NUM_PERM), dtype=np.int64)
+
+
+def cluster_labels(signatures, threshold=SIMILARITY_THRESHOLD):
+    """Group rows whose estimated Jaccard similarity passes threshold; returns a label per row.
+
+    LSH banding proposes candidates (rows sharing any band), which are confirmed against the
+    full signature before being merged, so the work scales with candidates rather than n².
+    Every pair in a bucket is checked when it has at most MAX_PAIRWISE_BUCKET members; larger
+    buckets only check each member against the first, so a similar pair there that doesn't
+    involve the first member can be missed unless another band links it.
+    """
+    n = len(signatures)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = NUM_PERM // LSH_BANDS
+    for band in range(LSH_BANDS):
+        block = signatures[:, band * rows:(band + 1) * rows]
+        _, bucket = np.unique(block, axis=0, return_inverse=True)
+        bucket = bucket.ravel()
+        order = np.argsort(bucket, kind="stable")
+        splits = np.flatnonzero(np.diff(bucket[order])) + 1
+        for members in np.split(order, splits):
+            if len(members) < 2:
+                continue
+            if len(members) <= MAX_PAIRWISE_BUCKET:
+                block_sigs = signatures[members]
+                similar = (block_sigs[:, None, :] == block_sigs[None, :, :]).mean(axis=2) >= threshold
+                pairs = zip(*np.nonzero(np.triu(similar, 1)))
+            else:
+                similarity = (signatures[members[1:]] == signatures[members[0]]).mean(axis=1)
+                pairs = ((0, k + 1) for k in np.flatnonzero(similarity >= threshold))
+            for a, b in pairs:
+                parent[find(members[b])] = find(members[a])
+
+    roots = np.array([find(i) for i in range(n)])
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels
+
+
+def assign_clusters(df, threshold=SIMILARITY_THRESHOLD):
+    """Add 'Cluster', 'Cluster Size' and 'Cluster Key' columns built from title, summary and style.
+
+    'Cluster Key' is the smallest video link in the cluster, which stays stable across
+    re-filtering and is used to share one insight per cluster.
+    """
+    if df.empty:
+        return df.assign(**{'Cluster': [], 'Cluster Size': [], 'Cluster Key': []})
+    docs = (df['Title'] + " " + df['Summary'] + " " + df['Style']).tolist()
+    labels = cluster_labels(minhash_signatures(docs), threshold)
+    df = df.assign(Cluster=labels)
+    grouped = df.groupby('Cluster')['Link']
+    return df.assign(**{
+        'Cluster Size': grouped.transform('size'),
+        'Cluster Key': grouped.transform('min'),
+    })
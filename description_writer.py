@@ -2,6 +2,96 @@ import streamlit as st
 import openai
 from openai import OpenAI
 
+# Feedback notes replayed on each revise call; older ones are dropped once the list is this long
+MAX_FEEDBACK_NOTES = 10
+
+
+def description_messages(title, keyword, topic, tone, goal):
+    prompt = f"""
+    You are a YouTube strategist and copywriter. Write an effective, engaging YouTube video description based on the following:
+
+    - Title: {title}
+    - Topic: {topic}
+    - Keyword: {keyword}
+    - Tone: {tone}
+    - Goal: {goal}
+
+    The description should:
+    - Be 1–3 paragraphs
+    - Naturally use the keyword or phrase
+    - Include calls to action if appropriate (subscribe, comment, visit links)
+    - Help with viewer retention and SEO
+
+    At the end, include a short explanation of how the description supports the goal.
+    """
+    return [
+        {"role": "system", "content": "You are a YouTube strategist who writes high-performing video descriptions."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def start_revision_session(title, keyword, output):
+    st.session_state.revision_session = {
+        "brief": f"Title: {title} | Keyword: {keyword}",
+        "original": output,
+        "current": output,
+        "feedback": [],
+        "revisions": 0,
+    }
+
+
+def build_revision_messages(session, feedback):
+    # Only the latest version is sent verbatim; earlier rounds survive as one-line notes of
+    # the feedback they applied, so each call costs about one description plus the feedback
+    applied = ""
+    if session["feedback"]:
+        applied = "Keep these earlier changes:\n" + "\n".join(f"- {f}" for f in session["feedback"]) + "\n\n"
+    return [
+        {"role": "system", "content": "You are a helpful YouTube strategist."},
+        {"role": "user", "content": (
+            f"Please revise the following YouTube video description ({session['brief']}):\n\n"
+            f"{session['current']}\n\n"
+            f"{applied}Based on this user feedback:\n{feedback}\n\n"
+            "Provide the improved description only."
+        )},
+    ]
+
+
+@st.fragment
+def revision_panel():
+    # Runs as a fragment so revising only redraws this panel, not the generated description above
+    client = OpenAI(api_key=st.secrets["api"]["openai_key"])
+    session = st.session_state.revision_session
+    st.markdown("---")
+    st.subheader("🔁 Want to revise this?")
+    if session["revisions"]:
+        st.caption(f"Revision {session['revisions']} — further feedback builds on this version.")
+        st.markdown(session["current"])
+    user_feedback = st.text_area("Tell us what you'd like to change or improve", placeholder="Make it more concise... remove the second paragraph...")
+    cols = st.columns([1, 1, 4])
+    revise_clicked = cols[0].button("Revise Description")
+    if cols[1].button("Start over") and session["revisions"]:
+        session["current"] = session["original"]
+        session["feedback"].clear()
+        session["revisions"] = 0
+        st.rerun(scope="fragment")
+    if revise_clicked and user_feedback:
+        st.markdown("## ✨ Revised Description")
+        try:
+            stream = client.chat.completions.create(
+                model="gpt-4",
+                messages=build_revision_messages(session, user_feedback),
+                temperature=st.session_state.get("revision_temperature", 0.7),
+                max_tokens=600,
+                stream=True
+            )
+            revised_output = st.write_stream(stream).strip()
+            session["current"] = revised_output
+            session["revisions"] += 1
+            session["feedback"] = (session["feedback"] + [user_feedback])[-MAX_FEEDBACK_NOTES:]
+        except Exception as e:
+            st.error(f"❌ Failed to revise description: {e}")
+
 
 def run():
     st.title("📝 YouTube Description Writer")
@@ -24,38 +114,20 @@ def run():
     if submitted and title and keyword:
         client = OpenAI(api_key=st.secrets["api"]["openai_key"])
 
-        prompt = f"""
-        You are a YouTube strategist and copywriter. Write an effective, engaging YouTube video description based on the following:
-
-        - Title: {title}
-        - Topic: {topic}
-        - Keyword: {keyword}
-        - Tone: {tone}
-        - Goal: {goal}
-
-        The description should:
-        - Be 1–3 paragraphs
-        - Naturally use the keyword or phrase
-        - Include calls to action if appropriate (subscribe, comment, visit links)
-        - Help with viewer retention and SEO
-
-        At the end, include a short explanation of how the description supports the goal.
-        """
-
         with st.spinner("Generating description..."):
             try:
+                messages = description_messages(title, keyword, topic, tone, goal)
                 response = client.chat.completions.create(
                     model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a YouTube strategist who writes high-performing video descriptions."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=messages,
                     temperature=temperature,
                     max_tokens=800
                 )
 
                 output = response.choices[0].message.content.strip()
                 st.session_state.generated_description = output
+                st.session_state.revision_temperature = temperature
+                start_revision_session(title, keyword, output)
                 st.markdown("## ✍️ Generated Description")
                 st.markdown(output)
 
@@ -66,35 +138,5 @@ def run():
                 st.error(f"❌ Failed to generate description: {e}")
 
     # Revision logic outside form block
-    if "generated_description" in st.session_state and "api" in st.secrets and "openai_key" in st.secrets["api"]:
-        client = OpenAI(api_key=st.secrets["api"]["openai_key"])
-        st.markdown("---")
-        st.subheader("🔁 Want to revise this?")
-        user_feedback = st.text_area("Tell us what you'd like to change or improve", placeholder="Make it more concise... remove the second paragraph...")
-        if st.button("Revise Description") and user_feedback:
-            revision_prompt = f"""
-            Please revise the following YouTube video description:
-
-            {st.session_state.generated_description}
-
-            Based on this user feedback:
-            {user_feedback}
-
-            Provide the improved description only.
-            """
-            with st.spinner("Revising..."):
-                try:
-                    revision = client.chat.completions.create(
-                        model="gpt-4",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful YouTube strategist."},
-                            {"role": "user", "content": revision_prompt}
-                        ],
-                        temperature=temperature,
-                        max_tokens=600
-                    )
-                    revised_output = revision.choices[0].message.content.strip()
-                    st.markdown("## ✨ Revised Description")
-                    st.markdown(revised_output)
-                except Exception as e:
-                    st.error(f"❌ Failed to revise description: {e}")
+    if "revision_session" in st.session_state and "api" in st.secrets and "openai_key" in st.secrets["api"]:
+        revision_panel()
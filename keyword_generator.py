@@ -3,12 +3,6 @@ import math
 import warnings
 from pytrends.request import TrendReq
 
-# Import tool modules
-import topic_researcher
-#import title_optimiser
-#import description_writer
-#import thumbnail_helper
-
 def get_trend_score(keyword: str) -> int:
     try:
         with warnings.catch_warnings():
@@ -37,6 +31,92 @@ def get_score_label(score):
     else:
         return "High Risk"
 
+def keyword_messages(user_input):
+    prompt = f"""
+    You are a video content strategist. Analyze the following keywords or phrases:
+
+    {user_input}
+
+    For each one:
+    - Score its popularity from 1–10
+    - Score its likely competition from 1–10 (higher = more competitive)
+    - Suggest if it's good for ranking or too saturated
+    - Recommend three alternative keywords or phrases that are more specific or have better SEO opportunity
+
+    Most importantly, include a unique and helpful insight for each keyword AND each alternative:
+    - Explain why this keyword might perform well or not
+    - Suggest content types, audience appeal, or strategic SEO intent
+    - Tailor the insight to the specific keyword — do not reuse language or generic phrases like "offers better SEO opportunity"
+
+    Return a markdown table using six columns:
+    | Keyword | Popularity | Competition | Rankability | Alternatives | Insight |
+    """
+    return [
+        {"role": "system", "content": "You are an SEO and YouTube keyword expert."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def table_rows(content):
+    lines = content.splitlines()
+    return [line for line in lines if line.strip().startswith("|") and not line.strip().startswith("|---")]
+
+
+def score_keyword_rows(rows, user_input):
+    """Score GPT's keyword table rows (header first) using live trend popularity where available.
+
+    Returns (keyword_blocks, main_keywords), where main_keywords are the lowercased keywords the user typed.
+    """
+    raw_keywords = [kw.strip().lower() for kw in user_input.replace(',', '\n').splitlines() if kw.strip()]
+
+    keyword_blocks = []
+    keyword_lookup = {}
+    main_keywords = set()
+
+    for row in rows[1:]:
+        cols = [c.strip() for c in row.strip('|').split('|')]
+        if len(cols) < 6:
+            continue
+
+        keyword, popularity, competition, rankability, alternatives, notes = cols
+        alt_list = [a.strip() for a in alternatives.split(',') if a.strip()]
+        try:
+            popularity = get_trend_score(keyword) or int(popularity)
+            competition = int(competition)
+        except:
+            continue
+
+        score = round(10 - math.sqrt((10 - popularity)**2 + competition**2) / 2, 1)
+
+        block = {
+            "keyword": keyword,
+            "popularity": popularity,
+            "competition": competition,
+            "score": score,
+            "rankability": ('Excellent' if score >= 8 else 'Good' if score >= 6 else 'Medium' if score >= 4 else 'Low'),
+            "alternatives": alt_list,
+            "notes": notes
+        }
+        keyword_blocks.append(block)
+        keyword_lookup[keyword.lower()] = block
+        if keyword.lower() in raw_keywords:
+            main_keywords.add(keyword.lower())
+
+        for alt in alt_list:
+            alt_key = alt.lower()
+            if alt_key not in keyword_lookup:
+                keyword_lookup[alt_key] = {
+                    "keyword": alt,
+                    "popularity": None,
+                    "competition": None,
+                    "score": None,
+                    "rankability": None,
+                    "notes": notes
+                }
+
+    return keyword_blocks, main_keywords
+
+
 # Sidebar Navigation
 def run():
     st.title("🔑 Keyword / Phrase Generator")
@@ -78,95 +158,23 @@ def run():
             client = OpenAI(api_key=st.secrets["api"]["openai_key"])
 
             with st.spinner("Analyzing with GPT..."):
-                prompt = f"""
-                You are a video content strategist. Analyze the following keywords or phrases:
-
-                {user_input}
-
-                For each one:
-                - Score its popularity from 1–10
-                - Score its likely competition from 1–10 (higher = more competitive)
-                - Suggest if it's good for ranking or too saturated
-                - Recommend three alternative keywords or phrases that are more specific or have better SEO opportunity
-
-                Most importantly, include a unique and helpful insight for each keyword AND each alternative:
-                - Explain why this keyword might perform well or not
-                - Suggest content types, audience appeal, or strategic SEO intent
-                - Tailor the insight to the specific keyword — do not reuse language or generic phrases like "offers better SEO opportunity"
-
-                Return a markdown table using six columns:
-                | Keyword | Popularity | Competition | Rankability | Alternatives | Insight |
-                """
-
-                import re
                 try:
                     response = client.chat.completions.create(
                         model="gpt-4",
-                        messages=[
-                            {"role": "system", "content": "You are an SEO and YouTube keyword expert."},
-                            {"role": "user", "content": prompt}
-                        ],
+                        messages=keyword_messages(user_input),
                         temperature=0.0,
                         max_tokens=1000
                     )
 
                     content = response.choices[0].message.content.strip()
-                    lines = content.splitlines()
-                    rows = [line for line in lines if line.strip().startswith("|") and not line.strip().startswith("|---")]
+                    rows = table_rows(content)
 
                     if not rows:
                         st.error("❌ GPT did not return a proper table format.")
                         st.code(content)
                         return
 
-                    from collections import defaultdict
-                    shown_keywords = set()
-                    raw_keywords = [kw.strip().lower() for kw in user_input.replace(',', '\n').splitlines() if kw.strip()]
-
-                    keyword_blocks = []
-                    keyword_lookup = {}
-                    main_keywords = set()
-
-                    for row in rows[1:]:
-                        cols = [c.strip() for c in row.strip('|').split('|')]
-                        if len(cols) < 6:
-                            continue
-
-                        keyword, popularity, competition, rankability, alternatives, notes = cols
-                        alt_list = [a.strip() for a in alternatives.split(',') if a.strip()]
-                        try:
-                            popularity = get_trend_score(keyword) or int(popularity)
-                            competition = int(competition)
-                        except:
-                            continue
-
-                        score = round(10 - math.sqrt((10 - popularity)**2 + competition**2) / 2, 1)
-
-                        block = {
-                            "keyword": keyword,
-                            "popularity": popularity,
-                            "competition": competition,
-                            "score": score,
-                            "rankability": ('Excellent' if score >= 8 else 'Good' if score >= 6 else 'Medium' if score >= 4 else 'Low'),
-                            "alternatives": alt_list,
-                            "notes": notes
-                        }
-                        keyword_blocks.append(block)
-                        keyword_lookup[keyword.lower()] = block
-                        if keyword.lower() in raw_keywords:
-                            main_keywords.add(keyword.lower())
-
-                        for alt in alt_list:
-                            alt_key = alt.lower()
-                            if alt_key not in keyword_lookup:
-                                keyword_lookup[alt_key] = {
-                                    "keyword": alt,
-                                    "popularity": None,
-                                    "competition": None,
-                                    "score": None,
-                                    "rankability": None,
-                                    "notes": notes
-                                }
+                    keyword_blocks, main_keywords = score_keyword_rows(rows, user_input)
 
                     # Display results
                     for block in keyword_blocks:
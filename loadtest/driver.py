@@ -0,0 +1,219 @@
+"""Concurrency load test: N simultaneous AppTest sessions driving each tool against local stubs.
+
+    python -m loadtest.driver --sessions 20 --iterations 3 --tools topic,keywords,title,description,thumb
+    python -m loadtest.driver --sessions 50 --openai-latency-ms 1500 --rate-limit 0.05
+
+For each tool it reports p50/p95/p99 latency of the user action (submit to results on screen),
+throughput in completed actions per second, and memory. "heap MB" and "RSS +MB" are how much a
+session grew over its iterations, measured from after the app has loaded and navigated to the
+tool, so imports and first-run setup aren't counted. "RSS MB" is the whole process's peak
+resident size; as each session is its own process, that includes the interpreter and every
+imported module, not just the session.
+
+AppTest swaps Streamlit's global Runtime and secrets on every run, so sessions can't share a
+process; each session runs in its own spawned process and all of them start acting together
+behind a barrier. Process-level pools (e.g. research_jobs) are therefore per session here, so
+this measures the container's CPU/upstream contention rather than shared-pool queueing.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+from loadtest.stubs import start_stub_server
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRETS = {"youtube_key": "load-test", "openai_key": "load-test"}
+
+PAGES = {
+    "topic": "🔍 Topic Researcher",
+    "keywords": "🔑 Keyword / Phrase Generator",
+    "title": "✍️ Title Optimiser",
+    "description": "📝 Description Writer",
+    "thumb": "🎨 Thumbnail Helper",
+}
+
+
+def point_app_at_stubs(base_url, db_path):
+    os.environ["YOUTUBE_API_ENDPOINT"] = f"{base_url}/youtube/v3/"
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    os.environ["CREATOR_TOOLKIT_DB"] = db_path
+    # pytrends has no endpoint option, so its module-level URLs are redirected in-process
+    import pytrends.request as trends
+    trends.BASE_TRENDS_URL = f"{base_url}/trends"
+    trends.TrendReq.GENERAL_URL = f"{base_url}/trends/api/explore"
+    trends.TrendReq.INTEREST_OVER_TIME_URL = f"{base_url}/trends/api/widgetdata/multiline"
+
+
+def new_session(tool):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=120)
+    at.secrets["api"] = SECRETS
+    at.run()
+    at.sidebar.radio[0].set_value(PAGES[tool]).run()
+    return at
+
+
+def click(at, label):
+    next(b for b in at.button if label in b.label).click().run()
+
+
+def act_topic(at, iteration):
+    # A new niche each iteration so the fetch isn't served from the session's cached results
+    at.text_input[0].set_value(f"fishkeeping|aquascaping|session {id(at)} run {iteration}")
+    click(at, "Find Videos")
+    while "research_job" in at.session_state:
+        time.sleep(0.25)
+        at.run()
+
+
+def act_keywords(at, iteration):
+    at.text_area[0].set_value("aquascaping, planted tank")
+    click(at, "Analyze Keywords")
+
+
+def act_title(at, iteration):
+    at.text_input[0].set_value("planted aquariums")
+    at.text_input[1].set_value("aquascaping for beginners")
+    click(at, "Generate Title Suggestions")
+
+
+def act_description(at, iteration):
+    at.text_input[0].set_value("5 Aquascaping Mistakes Every Beginner Makes")
+    at.text_input[1].set_value("aquascaping mistakes")
+    click(at, "Generate Description")
+    at.text_area[0].set_value("Make it shorter")
+    click(at, "Revise Description")
+
+
+def act_thumb(at, iteration):
+    at.text_input[0].set_value("5 Aquascaping Mistakes Every Beginner Makes")
+    at.text_input[1].set_value("aquascaping mistakes")
+    click(at, "Suggest Thumbnail Concepts")
+
+
+ACTIONS = {
+    "topic": act_topic,
+    "keywords": act_keywords,
+    "title": act_title,
+    "description": act_description,
+    "thumb": act_thumb,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def session_process(tool, iterations, base_url, db_path, barrier, results):
+    point_app_at_stubs(base_url, db_path)
+    sys.path.insert(0, APP_DIR)
+    latencies, errors = [], []
+    try:
+        at = new_session(tool)
+    except Exception as e:
+        at, errors = None, [f"session setup failed: {e!r}"]
+    # Baselines are taken once the app is loaded, so growth reflects the session, not imports
+    tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    heap_before, _ = tracemalloc.get_traced_memory()
+    barrier.wait()
+    for iteration in range(iterations if at else 0):
+        started = time.perf_counter()
+        try:
+            ACTIONS[tool](at, iteration)
+            # Uncaught exceptions and the tools' own st.error messages both count as failed actions
+            failed = [e.value.message if hasattr(e.value, "message") else str(e.value) for e in at.exception]
+            failed += [e.value for e in at.error]
+        except Exception as e:
+            failed = [repr(e)]
+        elapsed = time.perf_counter() - started
+        if failed:
+            errors.append(failed[0])
+        else:
+            latencies.append(elapsed)
+    heap_after, _ = tracemalloc.get_traced_memory()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put({
+        "latencies": latencies,
+        "errors": errors,
+        "heap_mb": (heap_after - heap_before) / 2**20,
+        "rss_growth_mb": (rss_after - rss_before) / 1024,
+        "rss_mb": rss_after / 1024,
+    })
+
+
+def run_tool(tool, sessions, iterations, base_url, db_path):
+    """Drive `sessions` concurrent sessions through `iterations` actions each; returns a stats dict."""
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(sessions + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=session_process, args=(tool, iterations, base_url, db_path, barrier, results)) for _ in range(sessions)]
+    for proc in procs:
+        proc.start()
+    barrier.wait()
+    wall_started = time.perf_counter()
+    reports = [results.get() for _ in procs]
+    wall = time.perf_counter() - wall_started
+    for proc in procs:
+        proc.join()
+
+    latencies = [t for r in reports for t in r["latencies"]]
+    errors = [e for r in reports for e in r["errors"]]
+    return {
+        "tool": tool,
+        "ok": len(latencies),
+        "failed": len(errors),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "heap_mb": sum(r["heap_mb"] for r in reports) / len(reports),
+        "rss_growth_mb": sum(r["rss_growth_mb"] for r in reports) / len(reports),
+        "rss_mb": sum(r["rss_mb"] for r in reports) / len(reports),
+        "first_error": errors[0] if errors else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Creator Toolkit against local API stand-ins.")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent AppTest sessions per tool")
+    parser.add_argument("--iterations", type=int, default=3, help="actions per session")
+    parser.add_argument("--tools", default=",".join(ACTIONS), help="comma-separated subset of " + ",".join(ACTIONS))
+    parser.add_argument("--youtube-latency-ms", type=float, default=150)
+    parser.add_argument("--openai-latency-ms", type=float, default=800)
+    parser.add_argument("--trends-latency-ms", type=float, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls answered with 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of upstream calls answered with 429")
+    parser.add_argument("--db", default=os.path.join(APP_DIR, "loadtest_snapshots.db"))
+    args = parser.parse_args()
+
+    shared = {"error_rate": args.error_rate, "rate_limit": args.rate_limit}
+    server, base_url = start_stub_server(faults={
+        "youtube": {"latency_ms": args.youtube_latency_ms, **shared},
+        "openai": {"latency_ms": args.openai_latency_ms, **shared},
+        "trends": {"latency_ms": args.trends_latency_ms, **shared},
+    })
+    print(f"Stubs on {base_url}; {args.sessions} sessions x {args.iterations} actions per tool\n")
+    print(f"{'tool':<12}{'ok':>5}{'fail':>6}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'act/s':>8}{'heap MB':>9}{'RSS +MB':>9}{'RSS MB':>9}")
+    try:
+        for tool in [t.strip() for t in args.tools.split(",") if t.strip()]:
+            stats = run_tool(tool, args.sessions, args.iterations, base_url, args.db)
+            print(f"{stats['tool']:<12}{stats['ok']:>5}{stats['failed']:>6}{stats['p50']:>9.2f}{stats['p95']:>9.2f}"
+                  f"{stats['p99']:>9.2f}{stats['throughput']:>8.2f}{stats['heap_mb']:>9.1f}{stats['rss_growth_mb']:>9.1f}{stats['rss_mb']:>9.1f}")
+            if stats["first_error"]:
+                print(f"    first error: {stats['first_error'][:200]}")
+        print(f"\nUpstream requests served: {dict(server.RequestHandlerClass.counts)}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Local stand-ins for the YouTube Data API, OpenAI and Google Trends.
+
+One threaded HTTP server answers all three under different path prefixes:
+
+    /youtube/v3/search, /youtube/v3/videos, /youtube/v3/channels
+    /v1/chat/completions (including stream=True), /v1/images/generations
+    /trends/explore/, /trends/api/explore, /trends/api/widgetdata/multiline
+
+Each service has its own latency, error rate and 429 rate so a load run can model a slow or
+throttled upstream. Run standalone with:
+
+    python -m loadtest.stubs --port 8765 --latency-ms 300 --rate-limit 0.05
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FAULTS = {"latency_ms": 200, "jitter_ms": 100, "error_rate": 0.0, "rate_limit": 0.0}
+
+CHAT_REPLIES = {
+    "keyword": (
+        "| Keyword | Popularity | Competition | Rankability | Alternatives | Insight |\n"
+        "|---|---|---|---|---|---|\n"
+        "| aquascaping | 7 | 6 | Good | nano aquascape, iwagumi layout, low tech aquascape | Evergreen hobby interest. |\n"
+        "| planted tank | 6 | 5 | Good | beginner planted tank, co2 planted tank, walstad tank | Strong tutorial intent. |"
+    ),
+    "title": (
+        "Title: 5 Aquascaping Mistakes Every Beginner Makes\n"
+        "Insight: Numbered lists and mistakes hooks drive curiosity.\n"
+        "Title: I Tried Aquascaping For 30 Days\n"
+        "Insight: Personal challenge framing builds watch time."
+    ),
+    "thumbnail": (
+        "Concept 1:\nDescription: Close-up of a lush tank with a shocked face.\nText: DON'T DO THIS\n"
+        "Insight: Faces and warnings raise CTR.\nPrompt: Lush planted aquarium, shocked presenter, bold red text\n"
+        "Concept 2:\nDescription: Before and after split.\nText: 30 DAYS\n"
+        "Insight: Transformation promise.\nPrompt: Split image of empty and planted aquarium"
+    ),
+}
+DEFAULT_CHAT_REPLY = (
+    "Dive into the world of aquascaping with this step-by-step guide. Subscribe for more planted tank tips!\n\n"
+    "This description supports the goal by front-loading the keyword and closing with a clear call to action."
+)
+
+
+def _video_ids(query, page, count):
+    digest = hashlib.md5(f"{query}:{page}".encode()).hexdigest()
+    return [f"{digest[:8]}{i:03d}" for i in range(count)]
+
+
+def _youtube_video(video_id):
+    rng = random.Random(video_id)
+    return {
+        "kind": "youtube#video",
+        "id": video_id,
+        "snippet": {
+            "title": f"How to aquascape a planted tank #{video_id[-3:]}",
+            "description": "A relaxing aquascaping tutorial for fishkeeping beginners.",
+            "channelId": f"UC{video_id[:6]}",
+            "channelTitle": f"Channel {video_id[:4]}",
+            "publishedAt": "2025-05-01T12:00:00Z",
+            "defaultAudioLanguage": "en",
+            "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"}},
+        },
+        "statistics": {
+            "viewCount": str(rng.randint(100, 2_000_000)),
+            "likeCount": str(rng.randint(0, 50_000)),
+            "commentCount": str(rng.randint(0, 5_000)),
+        },
+        "contentDetails": {"duration": f"PT{rng.randint(0, 40)}M{rng.randint(0, 59)}S"},
+    }
+
+
+def _youtube_channel(channel_id):
+    rng = random.Random(channel_id)
+    return {
+        "kind": "youtube#channel",
+        "id": channel_id,
+        "snippet": {
+            "description": "Aquascaping and fishkeeping every week.",
+            "thumbnails": {"default": {"url": f"https://yt3.ggpht.com/{channel_id}.jpg"}},
+        },
+        "statistics": {"subscriberCount": str(rng.randint(10, 3_000_000))},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    faults = {}
+    counts = {}
+    counts_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _service(self, path):
+        if path.startswith("/youtube/"):
+            return "youtube"
+        if path.startswith("/trends/"):
+            return "trends"
+        return "openai"
+
+    def _inject_faults(self, service):
+        """Sleep for the configured latency, then maybe answer with a 500 or 429. Returns True if it did."""
+        faults = self.faults.get(service, DEFAULT_FAULTS)
+        with self.counts_lock:
+            self.counts[service] = self.counts.get(service, 0) + 1
+        delay = max(0, faults["latency_ms"] + random.uniform(-faults["jitter_ms"], faults["jitter_ms"]))
+        time.sleep(delay / 1000)
+        roll = random.random()
+        if roll < faults["rate_limit"]:
+            self._send_json({"error": {"code": 429, "message": "Rate limit exceeded"}}, status=429, headers={"Retry-After": "1"})
+            return True
+        if roll < faults["rate_limit"] + faults["error_rate"]:
+            self._send_json({"error": {"code": 500, "message": "Stub backend error"}}, status=500)
+            return True
+        return False
+
+    def _send_json(self, payload, status=200, headers=None, prefix=""):
+        body = (prefix + json.dumps(payload)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw) if raw else {}
+        except ValueError:
+            return {}
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = self._read_body() if method == "POST" else {}
+        service = self._service(url.path)
+        if self._inject_faults(service):
+            return
+        if url.path.endswith("/search"):
+            self._youtube_search(query)
+        elif url.path.endswith("/videos"):
+            self._youtube_videos(query)
+        elif url.path.endswith("/channels"):
+            ids = query.get("id", "").split(",")
+            self._send_json({"kind": "youtube#channelListResponse", "items": [_youtube_channel(c) for c in ids if c]})
+        elif url.path.endswith("/chat/completions"):
+            self._chat(body)
+        elif url.path.endswith("/images/generations"):
+            self._send_json({"created": int(time.time()), "data": [{"url": "https://example.com/stub-thumbnail.png"}]})
+        elif url.path.startswith("/trends/explore"):
+            self.send_response(200)
+            self.send_header("Set-Cookie", "NID=stub; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif url.path.endswith("/api/explore"):
+            widgets = [{"id": "TIMESERIES", "request": {"time": "today 12-m"}, "token": "stub"}]
+            self._send_json({"widgets": widgets}, prefix=")]}'")
+        elif url.path.endswith("/widgetdata/multiline"):
+            start = int(time.time()) - 52 * 7 * 86400
+            timeline = [{"time": str(start + w * 7 * 86400), "value": [random.randint(20, 90)], "hasData": [True]} for w in range(52)]
+            self._send_json({"default": {"timelineData": timeline}}, prefix=")]}',")
+        else:
+            self._send_json({"error": {"code": 404, "message": f"No stub for {url.path}"}}, status=404)
+
+    def _youtube_search(self, query):
+        page = int(query.get("pageToken") or 0)
+        count = min(int(query.get("maxResults", 5)), 50)
+        items = [{"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": v}} for v in _video_ids(query.get("q", ""), page, count)]
+        payload = {"kind": "youtube#searchListResponse", "items": items}
+        if page < 3:
+            payload["nextPageToken"] = str(page + 1)
+        self._send_json(payload)
+
+    def _youtube_videos(self, query):
+        ids = [v for v in query.get("id", "").split(",") if v]
+        etag = hashlib.md5(",".join(ids).encode()).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json({"kind": "youtube#videoListResponse", "etag": etag, "items": [_youtube_video(v) for v in ids]})
+
+    def _chat(self, body):
+        system = " ".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "system").lower()
+        reply = next((text for cue, text in CHAT_REPLIES.items() if cue in system), DEFAULT_CHAT_REPLY)
+        model = body.get("model", "gpt-4")
+        if not body.get("stream"):
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + (" " if i < len(words) - 1 else "")}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+def start_stub_server(port=0, faults=None):
+    """Start the stand-in server on a background thread; returns (server, base_url).
+
+    faults maps "youtube" / "openai" / "trends" to dicts overriding DEFAULT_FAULTS.
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "faults": {name: {**DEFAULT_FAULTS, **(faults or {}).get(name, {})} for name in ("youtube", "openai", "trends")},
+        "counts": {},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_FAULTS["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_FAULTS["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of requests answered with 429")
+    args = parser.parse_args()
+    fault = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate, "rate_limit": args.rate_limit}
+    server, base_url = start_stub_server(args.port, {name: fault for name in ("youtube", "openai", "trends")})
+    print(f"Stub APIs on {base_url} — YOUTUBE_API_ENDPOINT={base_url}/youtube/v3/ OPENAI_BASE_URL={base_url}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
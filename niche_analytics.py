@@ -0,0 +1,145 @@
+import io
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+# Scatter points drawn at most; larger result sets are downsampled, always keeping the top viral videos
+MAX_SCATTER_POINTS = 2000
+TOP_VIRAL_KEPT = 200
+DURATION_BINS = [0, 1, 3, 5, 10, 15, 20, 30, 45, 60, np.inf]
+DURATION_LABELS = ["<1", "1–3", "3–5", "5–10", "10–15", "15–20", "20–30", "30–45", "45–60", "60+"]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def channel_summary(df, limit=25):
+    """Per-channel aggregates over the results, busiest channels first."""
+    grouped = df.groupby('Channel')
+    summary = grouped.agg(**{
+        'Videos': ('Link', 'size'),
+        'Subscribers': ('Subscribers', 'max'),
+        'Total Views': ('Views', 'sum'),
+        'Median Viral Score': ('Viral Score', 'median'),
+        'Best Viral Score': ('Viral Score', 'max'),
+        'Avg Views/Day': ('Views/Day', 'mean'),
+    })
+    return summary.sort_values(['Videos', 'Total Views'], ascending=False).head(limit).round(2).reset_index()
+
+
+def style_breakdown(df):
+    """Video counts by style and sentiment, plus the median viral score per style."""
+    counts = pd.crosstab(df['Style'], df['Sentiment Text'])
+    counts['Median Viral Score'] = df.groupby('Style')['Viral Score'].median().round(2)
+    return counts.sort_values('Median Viral Score', ascending=False)
+
+
+def scatter_sample(df, max_points=MAX_SCATTER_POINTS):
+    if len(df) <= max_points:
+        return df
+    top = df.nlargest(TOP_VIRAL_KEPT, 'Viral Score')
+    rest = df.drop(top.index).sample(max_points - len(top), random_state=0)
+    return pd.concat([top, rest])
+
+
+def to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=110, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def views_scatter(df):
+    sample = scatter_sample(df)
+    fig = Figure(figsize=(7, 4.5))
+    ax = fig.subplots()
+    points = ax.scatter(
+        sample['Subscribers'].clip(lower=1), sample['Views'].clip(lower=1),
+        c=np.log10(sample['Viral Score'].clip(lower=0.01)), cmap="plasma", s=14, alpha=0.7, linewidths=0,
+    )
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Subscribers")
+    ax.set_ylabel("Views")
+    title = "Views vs subscribers"
+    if len(sample) < len(df):
+        title += f" ({len(sample):,} of {len(df):,} videos)"
+    ax.set_title(title)
+    fig.colorbar(points, ax=ax, label="log10 Viral Score")
+    return to_png(fig)
+
+
+def duration_histogram(df):
+    bins = pd.cut(df['Duration (min)'], DURATION_BINS, labels=DURATION_LABELS, right=False)
+    grouped = df.groupby(bins, observed=False)['Viral Score']
+    counts, median_score = grouped.size(), grouped.median()
+    fig = Figure(figsize=(7, 3.5))
+    ax = fig.subplots()
+    ax.bar(DURATION_LABELS, counts.values, color="#4c78a8")
+    ax.set_xlabel("Duration (min)")
+    ax.set_ylabel("Videos")
+    score_ax = ax.twinx()
+    score_ax.plot(DURATION_LABELS, median_score.values, color="#e45756", marker="o")
+    score_ax.set_ylabel("Median Viral Score", color="#e45756")
+    ax.set_title("Video length")
+    return to_png(fig)
+
+
+def publish_histograms(df):
+    published = pd.to_datetime(df['Published'], utc=True, errors="coerce").dropna()
+    by_day = published.dt.dayofweek.value_counts().reindex(range(7), fill_value=0)
+    by_hour = published.dt.hour.value_counts().reindex(range(24), fill_value=0)
+    fig = Figure(figsize=(10, 3.5))
+    day_ax, hour_ax = fig.subplots(1, 2, gridspec_kw={"width_ratios": [1, 2]})
+    day_ax.bar(WEEKDAYS, by_day.values, color="#72b7b2")
+    day_ax.set_title("Published by weekday")
+    hour_ax.bar(by_hour.index, by_hour.values, color="#72b7b2")
+    hour_ax.set_title("Published by hour (UTC)")
+    hour_ax.set_xticks(range(0, 24, 3))
+    day_ax.set_ylabel("Videos")
+    return to_png(fig)
+
+
+def style_chart(breakdown):
+    counts = breakdown.drop(columns='Median Viral Score')
+    fig = Figure(figsize=(7, 3.5))
+    ax = fig.subplots()
+    bottom = np.zeros(len(counts))
+    for sentiment in counts.columns:
+        ax.bar(counts.index, counts[sentiment].values, bottom=bottom, label=sentiment)
+        bottom += counts[sentiment].values
+    ax.set_ylabel("Videos")
+    ax.set_title("Style and sentiment")
+    ax.legend(fontsize=8)
+    return to_png(fig)
+
+
+@st.cache_data(max_entries=16, show_spinner="Building analytics...")
+def niche_analytics(query_key, _df):
+    """Tables and PNG charts for a results frame, cached by query_key.
+
+    _df is left out of the cache hash so a large frame isn't re-hashed on every rerun;
+    query_key must therefore change whenever the rows would.
+    """
+    breakdown = style_breakdown(_df)
+    return {
+        "channels": channel_summary(_df),
+        "styles": breakdown,
+        "scatter": views_scatter(_df),
+        "duration": duration_histogram(_df),
+        "publish": publish_histograms(_df),
+        "style_chart": style_chart(breakdown),
+    }
+
+
+def render_analytics(df, query_key):
+    analytics = niche_analytics(query_key, df)
+    st.subheader("📊 Niche analytics")
+    st.caption(f"Across all {len(df):,} videos matching your filters, not just the top results listed below.")
+    st.image(analytics["scatter"])
+    cols = st.columns(2)
+    cols[0].image(analytics["duration"])
+    cols[1].image(analytics["style_chart"])
+    st.image(analytics["publish"])
+    st.markdown("**Top channels**")
+    st.dataframe(analytics["channels"], hide_index=True)
+    st.markdown("**Style and sentiment**")
+    st.dataframe(analytics["styles"])
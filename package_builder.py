@@ -0,0 +1,167 @@
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from openai import OpenAI
+
+from keyword_generator import keyword_messages, table_rows, score_keyword_rows
+from title_optimiser import title_messages, parse_titles, score_title
+from description_writer import description_messages
+from thumbnail_helper import thumbnail_messages, parse_concepts
+
+# Research styles mapped onto the closest option in each tool's tone picker
+TITLE_TONES = {"educational": "Educational", "funny": "Funny", "shocking": "Controversial", "entertaining": "Excited"}
+DESCRIPTION_TONES = {"educational": "Expert", "funny": "Funny", "shocking": "Friendly", "entertaining": "Friendly"}
+THUMBNAIL_VIBES = {"educational": "Curious", "funny": "Funny", "shocking": "Shocking", "entertaining": "Excited"}
+
+STAGE_LABELS = {
+    "keywords": "🔑 Keywords",
+    "titles": "✍️ Titles",
+    "description": "📝 Description",
+    "thumbnails": "🎨 Thumbnail concepts",
+}
+
+
+def package_context(row):
+    """Everything the stages share, worked out once from a research result row."""
+    style = row['Style']
+    keyword = row['Matched Keyword'].split(",")[0].strip() or row['Topic']
+    return {
+        "topic": row['Topic'],
+        "keyword": keyword,
+        "source_title": row['Title'],
+        "title_tone": TITLE_TONES.get(style, "Neutral"),
+        "description_tone": DESCRIPTION_TONES.get(style, "Neutral"),
+        "thumbnail_vibe": THUMBNAIL_VIBES.get(style, "Excited"),
+    }
+
+
+def complete(client, messages, temperature, max_tokens):
+    response = client.chat.completions.create(
+        model="gpt-4",
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
+
+
+def keywords_stage(client, ctx, done):
+    user_input = f"{ctx['keyword']}\n{ctx['topic']}"
+    rows = table_rows(complete(client, keyword_messages(user_input), 0.0, 1000))
+    if not rows:
+        raise ValueError("GPT did not return a proper table format.")
+    blocks, _ = score_keyword_rows(rows, user_input)
+    return sorted(blocks, key=lambda b: b["score"], reverse=True)
+
+
+def titles_stage(client, ctx, done):
+    output = complete(client, title_messages(ctx["topic"], ctx["keyword"], ctx["title_tone"], "Balanced (CTR + SEO)"), 0.7, 800)
+    return sorted(parse_titles(output), key=lambda t: score_title(t[0], ctx["keyword"]), reverse=True)
+
+
+def best_title(ctx, done):
+    return done["titles"][0][0] if done["titles"] else ctx["source_title"]
+
+
+def description_stage(client, ctx, done):
+    # Keywords are optional: their top pick is used only if scoring already finished, so a slow
+    # or failed Trends lookup never holds up or skips the description
+    keywords = done.get("keywords")
+    keyword = keywords[0]["keyword"] if keywords else ctx["keyword"]
+    messages = description_messages(best_title(ctx, done), keyword, ctx["topic"], ctx["description_tone"], "Balanced")
+    return complete(client, messages, 0.7, 800)
+
+
+def thumbnails_stage(client, ctx, done):
+    messages = thumbnail_messages(best_title(ctx, done), ctx["keyword"], ctx["thumbnail_vibe"], "Stand out from competition", ctx["thumbnail_hints"])
+    output = complete(client, messages, 0.8, 800)
+    return parse_concepts(output)
+
+
+# stage name -> (stages it needs, function(client, ctx, done)); done also holds any other stage
+# that had already finished when this one started
+PACKAGE_STAGES = {
+    "keywords": ((), keywords_stage),
+    "titles": ((), titles_stage),
+    "description": (("titles",), description_stage),
+    "thumbnails": (("titles",), thumbnails_stage),
+}
+
+
+def run_stages(stages, client, ctx, on_stage, max_workers=4):
+    """Run a stage dependency graph, starting each stage as soon as everything it needs has finished.
+
+    on_stage(name, result, error) is called on the calling thread as each stage settles, so it
+    may draw with Streamlit; the stage functions themselves run on worker threads and must not.
+    A failed stage marks everything downstream of it as failed without running it.
+    """
+    done, errors, running = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while len(done) + len(errors) < len(stages):
+            for name, (needs, fn) in stages.items():
+                if name in done or name in errors or name in running:
+                    continue
+                failed = [n for n in needs if n in errors]
+                if failed:
+                    errors[name] = f"skipped because {', '.join(failed)} failed"
+                    on_stage(name, None, errors[name])
+                elif all(n in done for n in needs):
+                    running[name] = pool.submit(fn, client, ctx, dict(done))
+            if not running:
+                continue
+            finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name in [n for n, f in running.items() if f in finished]:
+                future = running.pop(name)
+                try:
+                    done[name] = future.result()
+                    on_stage(name, done[name], None)
+                except Exception as e:
+                    errors[name] = str(e)
+                    on_stage(name, None, errors[name])
+    return done, errors
+
+
+def render_stage(name, result, error):
+    st.markdown(f"**{STAGE_LABELS[name]}**")
+    if error:
+        st.error(f"❌ {error}")
+    elif name == "keywords":
+        for block in result:
+            st.markdown(f"- **{block['keyword']}** — {block['score']}/10 ({block['rankability']})")
+    elif name == "titles":
+        for title, insight in result:
+            st.markdown(f"- **{title}**  \n  _{insight}_")
+    elif name == "description":
+        st.markdown(result)
+    elif name == "thumbnails":
+        for label, text, _ in result:
+            st.markdown(f"*{label}*  \n{text}")
+
+
+def build_package(row):
+    """Run every stage for a research row, drawing each one as it finishes; returns the package dict."""
+    client = OpenAI(api_key=st.secrets["api"]["openai_key"])
+    ctx = package_context(row)
+    analysis = st.session_state.get('thumbnail_hints')
+    ctx["thumbnail_hints"] = analysis["hints"] if analysis else []
+    st.caption(f"Topic: {ctx['topic']} | Keyword: {ctx['keyword']} | Tone: {ctx['title_tone']}")
+    slots = {name: st.empty() for name in PACKAGE_STAGES}
+    for name, slot in slots.items():
+        slot.info(f"⏳ {STAGE_LABELS[name]}...")
+
+    package = {"context": ctx, "stages": {}}
+
+    def on_stage(name, result, error):
+        package["stages"][name] = (result, error)
+        with slots[name].container():
+            render_stage(name, result, error)
+
+    run_stages(PACKAGE_STAGES, client, ctx, on_stage)
+    return package
+
+
+def render_package(package):
+    ctx = package["context"]
+    st.caption(f"Topic: {ctx['topic']} | Keyword: {ctx['keyword']} | Tone: {ctx['title_tone']}")
+    for name in PACKAGE_STAGES:
+        if name in package["stages"]:
+            render_stage(name, *package["stages"][name])
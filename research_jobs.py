@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Process-wide pool shared by every session, so one user's large run can't starve the container
+MAX_WORKERS = 4
+# Finished jobs stay available for this long so users can come back to them
+JOB_TTL_SECONDS = 3600
+
+_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="research-job")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def submit(fn, *args, label=""):
+    """Queue fn(job, *args) on the worker pool and return the new job's ID.
+
+    fn must not call Streamlit; it reports through report()/add_rows() and should
+    return early once cancelled(job) is true.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        "id": job_id,
+        "label": label,
+        "status": "queued",
+        "progress": {},
+        "rows": [],
+        "error": None,
+        "result": None,
+        "cancel": threading.Event(),
+        "created": time.time(),
+        "finished": None,
+    }
+    with _lock:
+        _evict_expired()
+        _jobs[job_id] = job
+    _pool.submit(_run, job, fn, args)
+    return job_id
+
+
+def _run(job, fn, args):
+    if job["cancel"].is_set():
+        _finish(job, "cancelled")
+        return
+    job["status"] = "running"
+    try:
+        result = fn(job, *args)
+    except Exception as e:
+        job["error"] = str(e)
+        _finish(job, "failed")
+        return
+    job["result"] = result
+    _finish(job, "cancelled" if job["cancel"].is_set() else "done")
+
+
+def _finish(job, status):
+    with _lock:
+        job["status"] = status
+        job["finished"] = time.time()
+
+
+def _evict_expired():
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for job_id in [j for j, job in _jobs.items() if job["finished"] and job["finished"] < cutoff]:
+        del _jobs[job_id]
+
+
+def get(job_id):
+    """Return a consistent copy of the job's state, or None if unknown or expired."""
+    with _lock:
+        _evict_expired()
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        view = {k: v for k, v in job.items() if k != "cancel"}
+        view["progress"] = dict(job["progress"])
+        view["rows"] = list(job["rows"])
+    return view
+
+
+def cancel(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+    if job:
+        job["cancel"].set()
+
+
+def cancelled(job):
+    return job["cancel"].is_set()
+
+
+def report(job, **counts):
+    """Add to the job's progress counters, e.g. report(job, pages=1)."""
+    with _lock:
+        for name, count in counts.items():
+            job["progress"][name] = job["progress"].get(name, 0) + count
+
+
+def add_rows(job, rows):
+    with _lock:
+        job["rows"].extend(rows)
@@ -0,0 +1,243 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+# Local history of video/channel statistics so research runs can refresh instead of re-searching
+DB_PATH = os.environ.get("CREATOR_TOOLKIT_DB", "creator_toolkit.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    channel_id TEXT,
+    channel_title TEXT,
+    published TEXT,
+    thumbnail TEXT,
+    language TEXT,
+    duration TEXT
+);
+CREATE TABLE IF NOT EXISTS video_stats (
+    video_id TEXT,
+    fetched_at TEXT,
+    views INTEGER,
+    likes INTEGER,
+    comments INTEGER,
+    PRIMARY KEY (video_id, fetched_at)
+);
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    subscribers INTEGER,
+    description TEXT,
+    avatar TEXT,
+    fetched_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tracked (
+    topic TEXT,
+    video_id TEXT,
+    niche TEXT,
+    PRIMARY KEY (topic, video_id)
+);
+CREATE TABLE IF NOT EXISTS etags (
+    request_key TEXT PRIMARY KEY,
+    etag TEXT
+);
+"""
+
+
+def now_utc():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def connect():
+    # A fresh connection per call keeps the store safe to use from worker threads
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_videos(videos, fetched_at=None):
+    """Store snippet/contentDetails and a statistics snapshot for raw `videos().list` items."""
+    fetched_at = fetched_at or now_utc()
+    with closing(connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(
+                v['id'],
+                v['snippet']['title'],
+                v['snippet'].get('description', ''),
+                v['snippet']['channelId'],
+                v['snippet']['channelTitle'],
+                v['snippet']['publishedAt'],
+                v['snippet']['thumbnails']['medium']['url'],
+                v['snippet'].get('defaultAudioLanguage', 'en'),
+                v.get('contentDetails', {}).get('duration', 'PT0M'),
+            ) for v in videos]
+        )
+    save_stats(videos, fetched_at)
+
+
+def save_stats(items, fetched_at=None):
+    """Record a statistics snapshot for items carrying `id` and `statistics`."""
+    fetched_at = fetched_at or now_utc()
+    with closing(connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO video_stats VALUES (?, ?, ?, ?, ?)",
+            [(
+                item['id'],
+                fetched_at,
+                int(item['statistics'].get('viewCount', 0)),
+                int(item['statistics'].get('likeCount', 0)),
+                int(item['statistics'].get('commentCount', 0)),
+            ) for item in items]
+        )
+
+
+def confirm_stats(video_ids, fetched_at=None):
+    """Re-record the latest snapshot as still current (e.g. after a 304 Not Modified)."""
+    fetched_at = fetched_at or now_utc()
+    with closing(connect()) as conn, conn:
+        conn.executemany(
+            """INSERT OR REPLACE INTO video_stats
+               SELECT video_id, ?, views, likes, comments FROM video_stats
+               WHERE video_id = ? ORDER BY fetched_at DESC LIMIT 1""",
+            [(fetched_at, video_id) for video_id in video_ids]
+        )
+
+
+def save_channels(channels, fetched_at=None):
+    """Store raw `channels().list` items."""
+    fetched_at = fetched_at or now_utc()
+    with closing(connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?)",
+            [(
+                c['id'],
+                int(c['statistics'].get('subscriberCount', 0)),
+                c['snippet'].get('description', ''),
+                c['snippet']['thumbnails']['default']['url'],
+                fetched_at,
+            ) for c in channels]
+        )
+
+
+def track(topic, video_niches):
+    """Remember which videos a research topic returned, and the niche that found each."""
+    with closing(connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tracked VALUES (?, ?, ?)",
+            [(topic, video_id, niche) for video_id, niche in video_niches.items()]
+        )
+
+
+def tracked_videos(topic):
+    """Return {video_id: niche} for every video previously tracked under this topic."""
+    with closing(connect()) as conn:
+        rows = conn.execute("SELECT video_id, niche FROM tracked WHERE topic = ?", (topic,)).fetchall()
+    return dict(rows)
+
+
+def _older_than(max_age_hours):
+    return datetime.now(timezone.utc).timestamp() - max_age_hours * 3600
+
+
+def stale_video_ids(video_ids, max_age_hours):
+    """IDs whose newest statistics snapshot is older than max_age_hours (or missing)."""
+    cutoff = _older_than(max_age_hours)
+    latest = _latest_fetch_times(video_ids)
+    return [v for v in video_ids if v not in latest or latest[v] < cutoff]
+
+
+def _latest_fetch_times(video_ids):
+    with closing(connect()) as conn:
+        rows = _select_in(conn, "SELECT video_id, MAX(fetched_at) FROM video_stats WHERE video_id IN ({}) GROUP BY video_id", video_ids)
+    return {video_id: datetime.fromisoformat(ts).timestamp() for video_id, ts in rows}
+
+
+def fresh_channels(channel_ids, max_age_hours):
+    """Return {channel_id: (subs, description, avatar_url)} for channels fetched within max_age_hours."""
+    cutoff = _older_than(max_age_hours)
+    with closing(connect()) as conn:
+        rows = _select_in(conn, "SELECT channel_id, subscribers, description, avatar, fetched_at FROM channels WHERE channel_id IN ({})", channel_ids)
+    return {
+        channel_id: (subs, description.lower(), avatar)
+        for channel_id, subs, description, avatar, fetched_at in rows
+        if datetime.fromisoformat(fetched_at).timestamp() >= cutoff
+    }
+
+
+def load_videos(video_ids):
+    """Rebuild `videos().list`-shaped items from the newest stored snapshot of each video."""
+    with closing(connect()) as conn:
+        rows = _select_in(conn, """
+            SELECT v.video_id, v.title, v.description, v.channel_id, v.channel_title, v.published,
+                   v.thumbnail, v.language, v.duration, s.views, s.likes, s.comments
+            FROM videos v
+            JOIN video_stats s ON s.video_id = v.video_id
+            WHERE v.video_id IN ({})
+              AND s.fetched_at = (SELECT MAX(fetched_at) FROM video_stats WHERE video_id = v.video_id)
+        """, video_ids)
+    return [{
+        'id': video_id,
+        'snippet': {
+            'title': title,
+            'description': description,
+            'channelId': channel_id,
+            'channelTitle': channel_title,
+            'publishedAt': published,
+            'thumbnails': {'medium': {'url': thumbnail}},
+            'defaultAudioLanguage': language,
+        },
+        'contentDetails': {'duration': duration},
+        'statistics': {'viewCount': views, 'likeCount': likes, 'commentCount': comments},
+    } for video_id, title, description, channel_id, channel_title, published, thumbnail, language, duration, views, likes, comments in rows]
+
+
+def views_per_day(video_ids):
+    """Views-per-day growth between each video's oldest and newest snapshot.
+
+    Videos with a single snapshot fall back to their lifetime average since publishing.
+    """
+    with closing(connect()) as conn:
+        rows = _select_in(conn, """
+            SELECT s.video_id, v.published,
+                   MIN(s.fetched_at), MAX(s.fetched_at),
+                   (SELECT views FROM video_stats WHERE video_id = s.video_id ORDER BY fetched_at ASC LIMIT 1),
+                   (SELECT views FROM video_stats WHERE video_id = s.video_id ORDER BY fetched_at DESC LIMIT 1)
+            FROM video_stats s JOIN videos v ON v.video_id = s.video_id
+            WHERE s.video_id IN ({})
+            GROUP BY s.video_id
+        """, video_ids)
+    growth = {}
+    for video_id, published, first_at, last_at, first_views, last_views in rows:
+        first_ts = datetime.fromisoformat(first_at).timestamp()
+        last_ts = datetime.fromisoformat(last_at).timestamp()
+        days = (last_ts - first_ts) / 86400
+        if days >= 1 / 24:
+            growth[video_id] = round((last_views - first_views) / days, 1)
+        else:
+            age_days = max((last_ts - datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp()) / 86400, 1)
+            growth[video_id] = round(last_views / age_days, 1)
+    return growth
+
+
+def get_etag(request_key):
+    with closing(connect()) as conn:
+        row = conn.execute("SELECT etag FROM etags WHERE request_key = ?", (request_key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_etag(request_key, etag):
+    with closing(connect()) as conn, conn:
+        conn.execute("INSERT OR REPLACE INTO etags VALUES (?, ?)", (request_key, etag))
+
+
+def _select_in(conn, sql, ids, chunk=500):
+    # Stay under SQLite's bound-parameter limit for large ID lists
+    ids = list(ids)
+    rows = []
+    for i in range(0, len(ids), chunk):
+        batch = ids[i:i+chunk]
+        rows.extend(conn.execute(sql.format(",".join("?" * len(batch))), batch).fetchall())
+    return rows
@@ -0,0 +1,68 @@
+import re
+
+
+def _trie_regex(terms):
+    # Build a character trie and render it as nested optional groups, e.g.
+    # ["fish", "fishkeeping", "fish tank"] -> fish(?:keeping|\ tank)?
+    # Sibling branches start with distinct characters, so the regex engine walks the trie
+    # without trying each term in turn, and greedy optionals give the longest term.
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+
+    return render(trie)
+
+
+def compile_matcher(terms):
+    """Compile terms into a single-pass matcher over lowercase text.
+
+    Returns find(text) -> [(term, start, end), ...] listing every occurrence of every term,
+    including overlapping ones and terms nested inside longer terms.
+    """
+    terms = sorted({t.lower() for t in terms if t and t.strip()})
+    if not terms:
+        return lambda text: []
+
+    # A zero-width lookahead lets the scan report the longest term starting at every position
+    pattern = re.compile('(?=(' + _trie_regex(terms) + '))')
+
+    # Shorter terms hidden inside a longer match are recovered from this table instead of rescanning
+    nested = {}
+    for term in terms:
+        for other in terms:
+            if other == term:
+                continue
+            offset = term.find(other)
+            while offset != -1:
+                nested.setdefault(term, []).append((other, offset))
+                offset = term.find(other, offset + 1)
+
+    def find(text):
+        hits = []
+        for m in pattern.finditer(text):
+            term, start = m.group(1), m.start()
+            hits.append((term, start, start + len(term)))
+            for other, offset in nested.get(term, ()):
+                hits.append((other, start + offset, start + offset + len(other)))
+        return hits
+
+    return find
+
+
+def is_whole_word(text, start, end):
+    """True if text[start:end] isn't glued to a letter, digit or underscore on either side."""
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not (before.isalnum() or before == '_') and not (after.isalnum() or after == '_')
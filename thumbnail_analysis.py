@@ -0,0 +1,203 @@
+import hashlib
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+from PIL import Image
+
+# Downloaded thumbnails are kept on disk by URL hash, so repeat analyses skip the network
+THUMB_CACHE_DIR = os.environ.get("CREATOR_TOOLKIT_THUMB_DIR", "thumb_cache")
+MAX_THUMBNAILS = 200
+DOWNLOAD_WORKERS = 16
+# Every thumbnail is resized to this before analysis so the whole batch stacks into one array
+ANALYSIS_SIZE = (160, 90)
+BLOCK = 10
+EDGE_THRESHOLD = 40
+PALETTE_LEVELS = 4
+
+FEATURES = ["Brightness", "Contrast", "Colourfulness", "Saturation", "Edge Density", "Text Area"]
+FEATURE_WORDS = {
+    "Brightness": ("brighter", "darker"),
+    "Contrast": ("higher-contrast", "flatter"),
+    "Colourfulness": ("more colourful", "more muted"),
+    "Saturation": ("more saturated", "less saturated"),
+    "Edge Density": ("busier", "cleaner"),
+    "Text Area": ("more text-heavy", "lighter on text"),
+}
+MIN_CORRELATION = 0.15
+
+
+def cache_path(url):
+    return os.path.join(THUMB_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".img")
+
+
+def fetch_thumbnail(url):
+    """Thumbnail bytes from the disk cache, downloading on a miss; None if it can't be fetched."""
+    path = cache_path(url)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    try:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    # Each writer gets its own temp file (sessions are threads in one process), and the rename
+    # is atomic, so the cache only ever holds complete downloads
+    try:
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=THUMB_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(response.content)
+            os.replace(tmp, path)
+        except OSError:
+            os.remove(tmp)
+            raise
+    except OSError:
+        pass
+    return response.content
+
+
+def load_batch(urls):
+    """Download thumbnails concurrently and stack them as a (n, height, width, 3) float array.
+
+    Returns (pixels, kept_urls); thumbnails that fail to download or decode are dropped.
+    """
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        blobs = list(pool.map(fetch_thumbnail, urls))
+    images, kept = [], []
+    for url, blob in zip(urls, blobs):
+        if not blob:
+            continue
+        try:
+            image = Image.open(io.BytesIO(blob)).convert("RGB").resize(ANALYSIS_SIZE)
+        except Exception:
+            continue
+        images.append(np.asarray(image, dtype=np.float32))
+        kept.append(url)
+    if not images:
+        return np.empty((0, ANALYSIS_SIZE[1], ANALYSIS_SIZE[0], 3), dtype=np.float32), kept
+    return np.stack(images), kept
+
+
+def dominant_palettes(pixels, colours=3):
+    """Top colours per image from a coarse PALETTE_LEVELS³ quantisation, as hex strings."""
+    n = len(pixels)
+    step = 256 // PALETTE_LEVELS
+    levels = (pixels // step).astype(np.int64).clip(0, PALETTE_LEVELS - 1)
+    bins = (levels[..., 0] * PALETTE_LEVELS + levels[..., 1]) * PALETTE_LEVELS + levels[..., 2]
+    bin_count = PALETTE_LEVELS ** 3
+    # Offsetting each image's bins lets one bincount histogram the whole batch
+    offsets = (np.arange(n) * bin_count)[:, None, None]
+    counts = np.bincount((bins + offsets).ravel(), minlength=n * bin_count).reshape(n, bin_count)
+    top = np.argsort(-counts, axis=1)[:, :colours]
+    centres = step * np.stack([top // PALETTE_LEVELS ** 2, top // PALETTE_LEVELS % PALETTE_LEVELS, top % PALETTE_LEVELS], axis=-1) + step // 2
+    return [" ".join(f"#{r:02x}{g:02x}{b:02x}" for r, g, b in image) for image in centres]
+
+
+def image_features(pixels):
+    """Feature columns for a stacked batch of RGB thumbnails, computed across the batch at once."""
+    r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    luma = 0.299 * r + 0.587 * g + 0.114 * b
+
+    # Hasler & Süsstrunk colourfulness from the opponent colour channels
+    rg, yb = r - g, 0.5 * (r + g) - b
+    colourfulness = np.sqrt(rg.std(axis=(1, 2)) ** 2 + yb.std(axis=(1, 2)) ** 2) + 0.3 * np.sqrt(rg.mean(axis=(1, 2)) ** 2 + yb.mean(axis=(1, 2)) ** 2)
+    high, low = pixels.max(axis=-1), pixels.min(axis=-1)
+    saturation = np.where(high > 0, (high - low) / np.maximum(high, 1), 0)
+
+    dx = np.abs(np.diff(luma, axis=2))[:, :-1, :]
+    dy = np.abs(np.diff(luma, axis=1))[:, :, :-1]
+    edges = np.maximum(dx, dy) > EDGE_THRESHOLD
+
+    # Overlaid text shows up as small blocks that are both edge-dense and strongly two-toned
+    n, h, w = edges.shape
+    bh, bw = h // BLOCK, w // BLOCK
+    block_edges = edges[:, :bh * BLOCK, :bw * BLOCK].reshape(n, bh, BLOCK, bw, BLOCK).mean(axis=(2, 4))
+    block_luma = luma[:, :bh * BLOCK, :bw * BLOCK].reshape(n, bh, BLOCK, bw, BLOCK).std(axis=(2, 4))
+    text_blocks = (block_edges > 0.2) & (block_luma > 45)
+
+    return pd.DataFrame({
+        "Brightness": luma.mean(axis=(1, 2)),
+        "Contrast": luma.std(axis=(1, 2)),
+        "Colourfulness": colourfulness,
+        "Saturation": saturation.mean(axis=(1, 2)),
+        "Edge Density": edges.mean(axis=(1, 2)),
+        "Text Area": text_blocks.mean(axis=(1, 2)),
+    }).round(3)
+
+
+def sample_for_analysis(df, limit=MAX_THUMBNAILS):
+    """Up to limit rows spread evenly across the Viral Score range, so correlations see both ends."""
+    ranked = df.sort_values('Viral Score')
+    if len(ranked) <= limit:
+        return ranked
+    return ranked.iloc[np.linspace(0, len(ranked) - 1, limit).astype(int)]
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def feature_matrix(urls):
+    """Features and palette per thumbnail URL; cached on the tuple of URLs."""
+    pixels, kept = load_batch(list(urls))
+    features = image_features(pixels)
+    features["Palette"] = dominant_palettes(pixels)
+    features.index = kept
+    return features
+
+
+def relate_to_viral_score(features, scores):
+    """Spearman correlation of each feature with Viral Score, plus top-quartile vs rest medians."""
+    data = features[FEATURES].assign(**{"Viral Score": scores.values})
+    correlation = data.rank().corr()["Viral Score"].drop("Viral Score")
+    top = data["Viral Score"] >= data["Viral Score"].quantile(0.75)
+    return pd.DataFrame({
+        "Correlation": correlation.round(2),
+        "Top 25% median": data.loc[top, FEATURES].median().round(3),
+        "Rest median": data.loc[~top, FEATURES].median().round(3),
+    }).sort_values("Correlation", key=np.abs, ascending=False)
+
+
+def thumbnail_hints(relation, features, scores):
+    """Plain-language hints for the features that track Viral Score in this result set."""
+    hints = []
+    for feature, row in relation.iterrows():
+        # A correlation with no difference in medians is driven by a handful of outliers
+        if pd.isna(row["Correlation"]) or abs(row["Correlation"]) < MIN_CORRELATION or row["Top 25% median"] == row["Rest median"]:
+            continue
+        word = FEATURE_WORDS[feature][0 if row["Correlation"] > 0 else 1]
+        hints.append(f"Top-performing thumbnails are {word} ({feature.lower()} {row['Top 25% median']:.2f} vs {row['Rest median']:.2f} for the rest).")
+    top = features.loc[scores.values >= scores.quantile(0.75), "Palette"]
+    if not top.empty:
+        common = pd.Series(" ".join(top).split()).value_counts().head(4).index
+        hints.append(f"Most common colours in top thumbnails: {', '.join(common)}.")
+    return hints
+
+
+def analyse_results(df, topic):
+    """Analyse the result set's thumbnails and store hints for the Thumbnail Helper."""
+    sample = sample_for_analysis(df[df['Thumbnail'].astype(bool)].drop_duplicates('Thumbnail'))
+    features = feature_matrix(tuple(sample['Thumbnail']))
+    if features.empty:
+        return None
+    scores = sample.set_index('Thumbnail').loc[features.index, 'Viral Score']
+    relation = relate_to_viral_score(features, scores)
+    analysis = {
+        "topic": topic,
+        "count": len(features),
+        "relation": relation,
+        "hints": thumbnail_hints(relation, features, scores),
+    }
+    st.session_state['thumbnail_hints'] = analysis
+    return analysis
+
+
+def render_analysis(analysis):
+    st.markdown(f"**🖼️ Thumbnail analysis — {analysis['count']} thumbnails from _{analysis['topic']}_**")
+    for hint in analysis["hints"] or ["No visual feature clearly tracks Viral Score in this result set."]:
+        st.markdown(f"- {hint}")
+    st.dataframe(analysis["relation"])
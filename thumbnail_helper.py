@@ -1,6 +1,77 @@
 import streamlit as st
 
 
+def thumbnail_messages(title, keyword, vibe, goal, hints=()):
+    thumb_prompt = f"""
+    You are a YouTube strategist and visual designer. Suggest 3 compelling, creative YouTube thumbnail ideas for the following:
+
+    - Title: {title}
+    - Keyword: {keyword}
+    - Tone/Emotion: {vibe}
+    - Strategy Goal: {goal}
+
+    Each suggestion should include:
+    - Description: A vivid visual scene (composition, subject, colors, layout)
+    - Insight: Why this visual style would be effective
+    - Prompt: A DALL·E-compatible AI image prompt to generate the thumbnail image
+
+    Format:
+    Concept 1:
+    Description: <...>
+    Text: <...>
+    Insight: <...>
+    """
+    if hints:
+        thumb_prompt += "\n    What the best-performing thumbnails in this niche have in common:\n" + "\n".join(f"    - {hint}" for hint in hints) + "\n"
+    return [
+        {"role": "system", "content": "You are a creative YouTube thumbnail designer."},
+        {"role": "user", "content": thumb_prompt}
+    ]
+
+
+def parse_concepts(result):
+    """Split a 'Concept N: ...' reply into (label, text, image prompt or None) tuples."""
+    concepts = []
+    for i, concept in enumerate(result.split("Concept ")):
+        if not concept.strip():
+            continue
+        concept_lines = concept.strip().splitlines()
+        prompt_line = next((line for line in concept_lines if line.lower().startswith("prompt:")), None)
+        prompt_text = prompt_line.replace("Prompt:", "").strip() if prompt_line else None
+        concepts.append((f"Concept {i}", "\n".join(concept_lines), prompt_text))
+    return concepts
+
+
+@st.fragment
+def concept_list():
+    # Runs as a fragment so generating one concept's image only redraws the concept list
+    st.markdown("## 💡 AI-Generated Thumbnail Concepts")
+    images = st.session_state.setdefault("thumb_images", {})
+    for label, concept_text, prompt_text in st.session_state.thumb_concepts:
+        st.markdown(f"### {label}")
+        st.markdown(concept_text)
+        if prompt_text and st.button(f"Generate this ({label})", key=f"gen_{label}"):
+            with st.spinner("Generating thumbnail image..."):
+                try:
+                    from openai import OpenAI
+                    client = OpenAI(api_key=st.secrets["api"]["openai_key"])
+                    image_response = client.images.generate(
+                        model="dall-e-3",
+                        prompt=prompt_text,
+                        size="1792x1024",
+                        quality="standard",
+                        n=1
+                    )
+                    images[label] = image_response.data[0].url
+                except Exception as e:
+                    st.error(f"❌ Failed to generate image: {e}")
+        if label in images:
+            st.image(images[label], caption=f"Generated for {label}", use_container_width=True)
+            with st.expander("💾 Download this image"):
+                st.markdown(f"[Right click here to download]({images[label]})")
+                st.info("If the link doesn't work directly, right click the image above and select 'Save image as...'")
+
+
 def run():
     st.title("🎨 Thumbnail Helper")
     st.markdown("""
@@ -37,6 +108,10 @@ def run():
         """)
 
     st.markdown("## 🛠️ Let's Design Your Perfect Thumbnail")
+    analysis = st.session_state.get("thumbnail_hints")
+    hints = analysis["hints"] if analysis else []
+    if hints:
+        st.info(f"📊 Using thumbnail data from {analysis['count']} _{analysis['topic']}_ videos in 🔍 Topic Researcher:\n\n" + "\n".join(f"- {hint}" for hint in hints))
     with st.form("thumb_form"):
         title = st.text_input("🎬 Video Title", placeholder="e.g. Best Plants for Discus Aquariums")
         keyword = st.text_input("🔑 Keyword or Phrase", placeholder="e.g. discus aquarium plants")
@@ -51,69 +126,23 @@ def run():
 
         with st.spinner("Generating thumbnail ideas with GPT..."):
             try:
-                thumb_prompt = f"""
-                You are a YouTube strategist and visual designer. Suggest 3 compelling, creative YouTube thumbnail ideas for the following:
-
-                - Title: {title}
-                - Keyword: {keyword}
-                - Tone/Emotion: {vibe}
-                - Strategy Goal: {goal}
-
-                Each suggestion should include:
-                - Description: A vivid visual scene (composition, subject, colors, layout)
-                - Insight: Why this visual style would be effective
-                - Prompt: A DALL·E-compatible AI image prompt to generate the thumbnail image
-
-                Format:
-                Concept 1:
-                Description: <...>
-                Text: <...>
-                Insight: <...>
-                """
-
                 response = client.chat.completions.create(
                     model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a creative YouTube thumbnail designer."},
-                        {"role": "user", "content": thumb_prompt}
-                    ],
+                    messages=thumbnail_messages(title, keyword, vibe, goal, hints),
                     temperature=0.8,
                     max_tokens=800
                 )
 
                 result = response.choices[0].message.content.strip()
-                st.markdown("## 💡 AI-Generated Thumbnail Concepts")
-                for i, concept in enumerate(result.split("Concept ")):
-                    if not concept.strip():
-                        continue
-                    concept_lines = concept.strip().splitlines()
-                    label = f"Concept {i}"
-                    st.markdown(f"### {label}")
-                    st.markdown("\n".join(concept_lines))
-                    prompt_line = next((line for line in concept_lines if line.lower().startswith("prompt:")), None)
-                    if prompt_line:
-                        prompt_text = prompt_line.replace("Prompt:", "").strip()
-                        if st.button(f"Generate this ({label})", key=f"gen_{i}"):
-                            with st.spinner("Generating thumbnail image..."):
-                                try:
-                                    image_response = client.images.generate(
-                                        model="dall-e-3",
-                                        prompt=prompt_text,
-                                        size="1792x1024",
-                                        quality="standard",
-                                        n=1
-                                    )
-                                    image_url = image_response.data[0].url
-                                    st.image(image_url, caption=f"Generated for {label}", use_container_width=True)
-                                    with st.expander("💾 Download this image"):
-                                        st.markdown(f"[Right click here to download]({image_url})")
-                                        st.info("If the link doesn't work directly, right click the image above and select 'Save image as...'")
-                                except Exception as e:
-                                    st.error(f"❌ Failed to generate image: {e}")
+                st.session_state.thumb_concepts = parse_concepts(result)
+                st.session_state.thumb_images = {}
 
             except Exception as e:
                 st.error(f"❌ Failed to generate thumbnail ideas: {e}")
 
+    if st.session_state.get("thumb_concepts"):
+        concept_list()
+
     st.markdown("---")
     st.markdown("## 🎨 Want to Create or Improve a Thumbnail?")
     choice = st.radio("Choose an option:", ["Generate from scratch", "Upload an image to enhance"])
@@ -0,0 +1,181 @@
+import math
+import re
+import sqlite3
+import threading
+from contextlib import closing
+
+import snapshot_store
+
+# Inverted n-gram index over researched titles, persisted next to the snapshot store and
+# weighted by Viral Score, so generated titles can be scored against what works in a niche
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS title_corpora (
+    topic TEXT PRIMARY KEY,
+    docs INTEGER,
+    weight REAL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS title_docs (
+    topic TEXT,
+    link TEXT,
+    title TEXT,
+    weight REAL,
+    PRIMARY KEY (topic, link)
+);
+CREATE TABLE IF NOT EXISTS title_ngrams (
+    topic TEXT,
+    ngram TEXT,
+    docs INTEGER,
+    weight REAL,
+    PRIMARY KEY (topic, ngram)
+);
+"""
+
+MAX_N = 3
+# N-grams seen in fewer titles than this are too thin to say anything about
+MIN_DOCS = 3
+# Shrinks log-lift towards 0 for rarely seen n-grams: a gram in PRIOR_DOCS titles keeps half of it
+PRIOR_DOCS = 5
+# Share of corpus titles above which an n-gram counts as over-used
+OVERUSE_SHARE = 0.15
+
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = {"the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "with", "is", "this", "i", "my", "your"}
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def connect():
+    conn = sqlite3.connect(snapshot_store.DB_PATH, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ngrams(title):
+    """Distinct 1- to MAX_N-word grams of a title; single stopwords are left out."""
+    words = _WORD.findall(title.lower())
+    grams = {w for w in words if w not in _STOPWORDS}
+    for n in range(2, MAX_N + 1):
+        grams.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return grams
+
+
+def title_weight(viral_score):
+    # Viral scores are heavy-tailed; log keeps one breakout video from owning the index
+    return math.log1p(max(viral_score, 0))
+
+
+def add_titles(topic, rows):
+    """Fold research rows (Link, Title, Viral Score) into the topic's index.
+
+    Videos already indexed have their old contribution replaced, so re-running or refreshing
+    a topic updates scores in place instead of double counting.
+    """
+    docs = {row['Link']: (row['Title'], title_weight(row['Viral Score'])) for row in rows}
+    if not docs:
+        return
+    deltas = {}
+    with closing(connect()) as conn, conn:
+        # Taken up front so two runs indexing the same topic can't both read the old rows
+        conn.execute("BEGIN IMMEDIATE")
+        placeholders = ",".join("?" * len(docs))
+        previous = conn.execute(
+            f"SELECT link, title, weight FROM title_docs WHERE topic = ? AND link IN ({placeholders})",
+            (topic, *docs)
+        ).fetchall()
+        for _, title, weight in previous:
+            for gram in ngrams(title):
+                count, total = deltas.get(gram, (0, 0.0))
+                deltas[gram] = (count - 1, total - weight)
+        for title, weight in docs.values():
+            for gram in ngrams(title):
+                count, total = deltas.get(gram, (0, 0.0))
+                deltas[gram] = (count + 1, total + weight)
+
+        conn.executemany(
+            """INSERT INTO title_ngrams VALUES (?, ?, ?, ?)
+               ON CONFLICT (topic, ngram) DO UPDATE SET docs = docs + excluded.docs, weight = weight + excluded.weight""",
+            [(topic, gram, count, total) for gram, (count, total) in deltas.items() if count or total]
+        )
+        conn.execute("DELETE FROM title_ngrams WHERE topic = ? AND docs <= 0", (topic,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO title_docs VALUES (?, ?, ?, ?)",
+            [(topic, link, title, weight) for link, (title, weight) in docs.items()]
+        )
+        new_docs = len(docs) - len(previous)
+        new_weight = sum(w for _, w in docs.values()) - sum(w for _, _, w in previous)
+        conn.execute(
+            """INSERT INTO title_corpora VALUES (?, ?, ?, ?)
+               ON CONFLICT (topic) DO UPDATE SET docs = docs + excluded.docs, weight = weight + excluded.weight,
+               updated_at = excluded.updated_at""",
+            (topic, new_docs, new_weight, snapshot_store.now_utc())
+        )
+    with _loaded_lock:
+        _loaded.pop(topic, None)
+
+
+def topics():
+    """Indexed topics with their title counts, most recently updated first."""
+    with closing(connect()) as conn:
+        return conn.execute("SELECT topic, docs FROM title_corpora WHERE docs > 0 ORDER BY updated_at DESC").fetchall()
+
+
+def matching_topic(text, candidates):
+    """The indexed topic sharing the most non-stopword terms with text, or None if none share any."""
+    words = set(_WORD.findall(text.lower())) - _STOPWORDS
+    overlap = {topic: len(words & (set(_WORD.findall(topic.lower())) - _STOPWORDS)) for topic in candidates}
+    best = max(overlap, key=overlap.get, default=None)
+    return best if best and overlap[best] else None
+
+
+def load(topic):
+    """The topic's index as in-memory dicts, read from SQLite once and reused until it changes."""
+    with _loaded_lock:
+        if topic in _loaded:
+            return _loaded[topic]
+    with closing(connect()) as conn:
+        corpus = conn.execute("SELECT docs, weight FROM title_corpora WHERE topic = ?", (topic,)).fetchone()
+        rows = conn.execute("SELECT ngram, docs, weight FROM title_ngrams WHERE topic = ? AND docs >= ?", (topic, MIN_DOCS)).fetchall()
+    docs, weight = corpus or (0, 0.0)
+    mean = weight / docs if docs else 0.0
+    index = {
+        "topic": topic,
+        "docs": docs,
+        "niche_words": set(_WORD.findall(topic.lower())) - _STOPWORDS,
+        # Per gram: shrunk log-lift against the corpus mean weight, and share of titles using it
+        "lift": {gram: (count / (count + PRIOR_DOCS)) * math.log((total / count) / mean) for gram, count, total in rows if total > 0 and mean > 0},
+        "share": {gram: count / docs for gram, count, _ in rows},
+    }
+    with _loaded_lock:
+        _loaded[topic] = index
+    return index
+
+
+def score_title(index, title, keyword=""):
+    """Score a candidate title 0–10 against the index, with the grams behind the score.
+
+    Grams that perform above the niche average push the score up, weaker ones pull it down,
+    and grams used by more than OVERUSE_SHARE of titles cost points for blending in. Grams made
+    only of the niche's own terms or the target keyword are expected in most titles, so they
+    never count as over-used.
+    """
+    lift, share = index["lift"], index["share"]
+    target_words = index["niche_words"] | set(_WORD.findall(keyword.lower()))
+    grams = [g for g in ngrams(title) if g in lift]
+    evidence = sum(lift[g] for g in grams) / len(grams) if grams else 0.0
+    overused = [g for g in grams if share[g] > OVERUSE_SHARE and not set(g.split()) - _STOPWORDS <= target_words]
+    penalty = max((share[g] - OVERUSE_SHARE for g in overused), default=0.0)
+    score = 5 + 4 * math.tanh(evidence) - 10 * penalty
+    return {
+        "score": round(min(max(score, 0), 10), 1),
+        "boosters": sorted((g for g in grams if lift[g] > 0), key=lift.get, reverse=True)[:3],
+        "drags": sorted((g for g in grams if lift[g] < 0), key=lift.get)[:3],
+        "overused": overused,
+    }
+
+
+def rank_titles(index, titles, keyword=""):
+    """Candidate titles sorted best first, each paired with its score_title() result."""
+    scored = [(title, score_title(index, title, keyword)) for title in titles]
+    return sorted(scored, key=lambda t: t[1]["score"], reverse=True)
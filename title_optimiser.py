@@ -2,6 +2,57 @@ import streamlit as st
 import openai
 from openai import OpenAI
 
+import title_index
+
+
+def title_messages(topic, keyword, tone, goal):
+    prompt = f"""
+    You are a YouTube strategist and headline copywriter.
+
+    Based on the following:
+    - Topic: {topic}
+    - Keyword: {keyword}
+    - Tone: {tone}
+    - Goal: {goal}
+
+    Generate 3 to 5 optimised YouTube video titles. Each title must:
+    - Include the keyword or a close variation
+    - Be no longer than 70 characters
+    - Be designed to increase CTR and/or rank for search
+
+    After each title, include a brief insight (1–2 sentences) on why it works.
+
+    Format:
+    Title: <title>
+    Insight: <why this works>
+    """
+    return [
+        {"role": "system", "content": "You are a YouTube strategist that specialises in writing video titles."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def parse_titles(output):
+    """Split a 'Title: ... / Insight: ...' reply into (title, insight) pairs."""
+    titles = []
+    for entry in output.split("Title:"):
+        if not entry.strip():
+            continue
+        lines = entry.strip().split("\n")
+        title = lines[0].strip()
+        insight = next((line.replace("Insight:", "").strip() for line in lines if "Insight:" in line), "")
+        titles.append((title, insight))
+    return titles
+
+
+def score_title(title, keyword):
+    # Evaluate balance score (basic rule: keyword in title + length < 70)
+    score = 0
+    if keyword.lower() in title.lower():
+        score += 5
+    score += max(0, 5 - int((len(title) - 50) / 5)) if len(title) <= 70 else 0
+    return min(score, 10)
+
 
 def run():
     st.title("🎯 YouTube Title Optimiser")
@@ -18,61 +69,46 @@ def run():
         goal = st.selectbox("🎯 Primary goal", ["Max CTR (Clickbait-ish)", "Balanced (CTR + SEO)", "SEO-Optimised"])
         temp_label = st.radio("🧪 Creativity level", ["Safe", "Balanced", "Wild"], horizontal=True)
         temperature = {"Safe": 0.3, "Balanced": 0.7, "Wild": 1.0}[temp_label]
+        corpora = {f"{name} ({docs} titles)": name for name, docs in title_index.topics()}
+        corpus = st.selectbox(
+            "📚 Score against researched niche",
+            ["Auto (matching niche only)", "None"] + list(corpora),
+            help="Niches you've run through 🔍 Topic Researcher. Titles are scored on which phrases perform in that niche's results. Auto picks the niche sharing the most terms with your topic and keyword, and skips niche scoring if none do.",
+        )
         submitted = st.form_submit_button("Generate Title Suggestions")
 
     if submitted and keyword:
         client = OpenAI(api_key=st.secrets["api"]["openai_key"])
 
-        prompt = f"""
-        You are a YouTube strategist and headline copywriter.
-
-        Based on the following:
-        - Topic: {topic}
-        - Keyword: {keyword}
-        - Tone: {tone}
-        - Goal: {goal}
-
-        Generate 3 to 5 optimised YouTube video titles. Each title must:
-        - Include the keyword or a close variation
-        - Be no longer than 70 characters
-        - Be designed to increase CTR and/or rank for search
-
-        After each title, include a brief insight (1–2 sentences) on why it works.
-
-        Format:
-        Title: <title>
-        Insight: <why this works>
-        """
-
         with st.spinner("Generating titles..."):
             try:
                 response = client.chat.completions.create(
                     model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a YouTube strategist that specialises in writing video titles."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=title_messages(topic, keyword, tone, goal),
                     temperature=temperature,
                     max_tokens=800
                 )
 
                 output = response.choices[0].message.content.strip()
-                entries = output.split("Title:")
-                for entry in entries:
-                    if not entry.strip():
-                        continue
-                    lines = entry.strip().split("\n")
-                    title = lines[0].strip()
-                    insight = next((line.replace("Insight:", "").strip() for line in lines if "Insight:" in line), "")
-
+                titles = parse_titles(output)
+                # Auto only scores against a niche that shares terms with this video's topic or keyword
+                if corpus in corpora:
+                    niche_topic = corpora[corpus]
+                elif corpus.startswith("Auto"):
+                    niche_topic = title_index.matching_topic(f"{topic} {keyword}", corpora.values())
+                else:
+                    niche_topic = None
+                index = title_index.load(niche_topic) if niche_topic else None
+                if index:
+                    # Best niche match first
+                    insights = dict(titles)
+                    niche_scores = dict(title_index.rank_titles(index, insights, keyword))
+                    titles = [(title, insights[title]) for title in niche_scores]
+
+                for title, insight in titles:
                     st.markdown(f"### 🎬 {title}")
 
-                    # Evaluate balance score (basic rule: keyword in title + length < 70)
-                    score = 0
-                    if keyword.lower() in title.lower():
-                        score += 5
-                    score += max(0, 5 - int((len(title) - 50) / 5)) if len(title) <= 70 else 0
-                    score = min(score, 10)
+                    score = score_title(title, keyword)
 
                     color = "green" if score >= 7 else "orange" if score >= 4 else "red"
 
@@ -82,6 +118,17 @@ def run():
                         </div>
                     """, unsafe_allow_html=True)
 
+                    if index:
+                        niche = niche_scores[title]
+                        notes = []
+                        if niche["boosters"]:
+                            notes.append(f"performs well: _{', '.join(niche['boosters'])}_")
+                        if niche["drags"]:
+                            notes.append(f"underperforms: _{', '.join(niche['drags'])}_")
+                        if niche["overused"]:
+                            notes.append(f"over-used: _{', '.join(niche['overused'])}_")
+                        st.markdown(f"📚 **Niche score: {niche['score']}/10** vs {index['docs']} researched _{index['topic']}_ titles" + (" — " + "; ".join(notes) if notes else ""))
+
                     st.markdown(f"<span style='color: #999;'>{insight}</span>", unsafe_allow_html=True)
 
             except Exception as e:
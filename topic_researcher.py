@@ -1,83 +1,343 @@
 import streamlit as st
 import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta, timezone
 import pandas as pd
 from textblob import TextBlob
-import matplotlib.pyplot as plt
 from iso639 import languages
 import isodate
 from openai import OpenAI
+import snapshot_store
+import clustering
+import research_jobs
+import package_builder
+import niche_analytics
+import thumbnail_analysis
+import title_index
+from text_matcher import compile_matcher, is_whole_word
+
+# Upper bound on concurrent per-niche searches in fan-out mode
+MAX_SEARCH_WORKERS = 8
+# Channel subscriber counts move slowly, so stored ones are reused for this long
+CHANNEL_MAX_AGE_HOURS = 72
+# How often the page polls a running research job for progress
+JOB_POLL_SECONDS = 1.0
+
+# Description cues for each style, checked in priority order
+STYLE_CUES = {
+    "educational": ("tutorial", "how to"),
+    "funny": ("funny", "joke"),
+    "shocking": ("shocking", "unbelievable"),
+}
+
+
+def filter_results(df, filters):
+    """Apply filters to the fetched results frame without touching the API.
+
+    All checks are vectorised column masks, so a slider change re-queries in milliseconds.
+    """
+    if df.empty:
+        return df
+    if filters['whole_words']:
+        df = df.assign(**{'Matched Keyword': df['Matched Keyword (word)'], 'Keyword Hits': df['Keyword Hits (word)']})
+    mask = df['Language'] == filters['language']
+    duration = df['Duration (min)']
+    known = df['Duration Known']
+    if filters['shorts'] == "Shorts only":
+        mask &= known & (duration <= 2.0)
+    elif filters['shorts'] == "Exclude Shorts":
+        mask &= ~(known & (duration <= 2.0))
+    if filters['strict']:
+        mask &= df['Keyword Hits'] == df['Keyword Count']
+    for column in ('Subscribers', 'Views', 'Likes', 'Comments'):
+        low, high = filters[column]
+        mask &= df[column].between(low, high)
+    dur_min, dur_max = filters['Duration (min)']
+    mask &= ~known | duration.between(dur_min, dur_max)
+
+    return df[mask]
+
+
+def top_results(df, sort_by, ascending, top_k):
+    if df.empty:
+        return df
+    if ascending:
+        return df.nsmallest(top_k, sort_by, keep='first')
+    return df.nlargest(top_k, sort_by, keep='first')
+
+
+def query_results(df, filters, sort_by, ascending, top_k):
+    return top_results(filter_results(df, filters), sort_by, ascending, top_k)
+
+
+def youtube_service(youtube_key):
+    # googleapiclient services are not thread-safe, so each worker thread builds its own.
+    # YOUTUBE_API_ENDPOINT points the client at a stand-in server (see loadtest/stubs.py).
+    endpoint = os.environ.get("YOUTUBE_API_ENDPOINT")
+    client_options = {"api_endpoint": endpoint} if endpoint else None
+    return build('youtube', 'v3', developerKey=youtube_key, client_options=client_options)
+
+
+def search_videos(service, keyword, published_after, max_results=100, job=None):
+    all_items = []
+    next_page_token = None
+    while len(all_items) < max_results:
+        response = service.search().list(
+            q=keyword,
+            type='video',
+            part='id,snippet',
+            maxResults=min(50, max_results - len(all_items)),
+            publishedAfter=published_after,
+            pageToken=next_page_token
+        ).execute()
+        all_items.extend(response['items'])
+        if job:
+            research_jobs.report(job, pages=1)
+            if research_jobs.cancelled(job):
+                break
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            break
+    return all_items
+
+
+def search_niche(youtube_key, niche, published_after, max_results, job=None):
+    return niche, search_videos(youtube_service(youtube_key), niche, published_after, max_results, job)
+
+
+def fan_out_search(youtube_key, niches, published_after, max_results, job=None):
+    """Search each niche in parallel with its own budget; return {video_id: niche} deduped by ID."""
+    found = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(niches))) as pool:
+        futures = [pool.submit(search_niche, youtube_key, niche, published_after, max_results, job) for niche in niches]
+        for future in futures:
+            niche, items = future.result()
+            for item in items:
+                found.setdefault(item['id']['videoId'], niche)
+    return found
+
+
+def get_video_details(service, video_ids):
+    details = []
+    for i in range(0, len(video_ids), 50):
+        batch = video_ids[i:i+50]
+        response = service.videos().list(
+            part='snippet,statistics,contentDetails',
+            id=','.join(batch)
+        ).execute()
+        details.extend(response['items'])
+    return details
 
-def run():
-    youtube = build('youtube', 'v3', developerKey=st.secrets["api"]["youtube_key"])
-    client = OpenAI(api_key=st.secrets["api"]["openai_key"])
 
-    def search_videos(keyword, published_after, max_results=100):
-        all_items = []
-        next_page_token = None
-        while len(all_items) < max_results:
-            response = youtube.search().list(
-                q=keyword,
-                type='video',
-                part='id,snippet',
-                maxResults=min(50, max_results - len(all_items)),
-                publishedAfter=published_after,
-                pageToken=next_page_token
-            ).execute()
-            all_items.extend(response['items'])
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-        return all_items
-
-    def get_video_details(video_ids):
-        details = []
-        for i in range(0, len(video_ids), 50):
-            batch = video_ids[i:i+50]
-            response = youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=','.join(batch)
-            ).execute()
-            details.extend(response['items'])
-        return details
-
-    def get_channel_info(channel_id):
-        response = youtube.channels().list(
+def get_channels(service, channel_ids, max_age_hours=CHANNEL_MAX_AGE_HOURS):
+    """Return {channel_id: (subs, description, avatar_url)}, querying only channels not fresh in the store."""
+    channels = snapshot_store.fresh_channels(channel_ids, max_age_hours)
+    missing = [c for c in channel_ids if c not in channels]
+    for i in range(0, len(missing), 50):
+        response = service.channels().list(
             part='snippet,statistics',
-            id=channel_id
+            id=','.join(missing[i:i+50])
         ).execute()
-        channel = response['items'][0]
-        subs = int(channel['statistics'].get('subscriberCount', 0))
-        description = channel['snippet'].get('description', '').lower()
-        avatar_url = channel['snippet']['thumbnails']['default']['url']
-        return subs, description, avatar_url
-
-    def classify_description(desc):
-        blob = TextBlob(desc)
-        sentiment_score = blob.sentiment.polarity
-        if sentiment_score > 0.3:
-            sentiment_text = "Positive tone"
-        elif sentiment_score < -0.3:
-            sentiment_text = "Negative tone"
-        else:
-            sentiment_text = "Neutral tone"
-        if "tutorial" in desc.lower() or "how to" in desc.lower():
-            style = "educational"
-        elif "funny" in desc.lower() or "joke" in desc.lower():
-            style = "funny"
-        elif "shocking" in desc.lower() or "unbelievable" in desc.lower():
-            style = "shocking"
+        snapshot_store.save_channels(response['items'])
+        for channel in response['items']:
+            subs = int(channel['statistics'].get('subscriberCount', 0))
+            description = channel['snippet'].get('description', '').lower()
+            avatar_url = channel['snippet']['thumbnails']['default']['url']
+            channels[channel['id']] = (subs, description, avatar_url)
+    return channels
+
+
+def refresh_stats(service, video_ids, max_age_hours):
+    """Re-query statistics for stale videos only (1 unit per 50 IDs), sending stored ETags."""
+    stale = sorted(snapshot_store.stale_video_ids(video_ids, max_age_hours))
+    for i in range(0, len(stale), 50):
+        batch = stale[i:i+50]
+        request_key = 'videos.statistics:' + ','.join(batch)
+        request = service.videos().list(part='statistics', id=','.join(batch))
+        etag = snapshot_store.get_etag(request_key)
+        if etag:
+            request.headers['If-None-Match'] = etag
+        try:
+            response = request.execute()
+        except HttpError as e:
+            if e.resp.status != 304:
+                raise
+            snapshot_store.confirm_stats(batch)
+            continue
+        snapshot_store.save_stats(response['items'])
+        if response.get('etag'):
+            snapshot_store.set_etag(request_key, response['etag'])
+    return len(stale)
+
+
+def classify_description(desc, cues):
+    blob = TextBlob(desc)
+    sentiment_score = blob.sentiment.polarity
+    if sentiment_score > 0.3:
+        sentiment_text = "Positive tone"
+    elif sentiment_score < -0.3:
+        sentiment_text = "Negative tone"
+    else:
+        sentiment_text = "Neutral tone"
+    style = next((name for name, terms in STYLE_CUES.items() if cues.intersection(terms)), "entertaining")
+    return desc[:200], style, sentiment_score, sentiment_text
+
+
+def parse_duration(iso_duration):
+    try:
+        duration = isodate.parse_duration(iso_duration)
+        return duration.total_seconds() / 60
+    except:
+        return None
+
+
+def enrich_videos(service, videos, video_niches, topic, keywords):
+    """Score and classify raw video items; every video is kept so filtering can run locally."""
+    channels = get_channels(service, {video['snippet']['channelId'] for video in videos})
+    growth = snapshot_store.views_per_day([video['id'] for video in videos])
+    # One compiled pass per video finds niche keywords anywhere and style cues in the description
+    cue_terms = [cue for cues in STYLE_CUES.values() for cue in cues]
+    find_terms = compile_matcher(keywords + cue_terms)
+    all_results = []
+    for video in videos:
+        snippet = video['snippet']
+        # creator_names = [name.strip().lower() for name in creator_filter.split(',') if name.strip()]
+        # if creator_names and snippet['channelTitle'].lower() not in creator_names:
+        #     continue
+        stats = video['statistics']
+        content = video.get('contentDetails', {})
+        views = int(stats.get('viewCount', 0))
+        likes = int(stats.get('likeCount', 0))
+        comments = int(stats.get('commentCount', 0))
+        duration = parse_duration(content.get('duration', 'PT0M'))
+
+        channel_id = snippet['channelId']
+        subs, channel_description, avatar_url = channels.get(channel_id, (0, '', ''))
+        desc = snippet.get('description', '')
+        title_text, desc_text = snippet['title'].lower(), desc.lower()
+        combined_text = f"{title_text} {desc_text} {channel_description}"
+        desc_start, desc_end = len(title_text) + 1, len(title_text) + 1 + len(desc_text)
+        found, found_whole, cues = set(), set(), set()
+        for term, start, end in find_terms(combined_text):
+            found.add(term)
+            if is_whole_word(combined_text, start, end):
+                found_whole.add(term)
+            if desc_start <= start and end <= desc_end:
+                cues.add(term)
+        matched = [k for k in keywords if k in found]
+        matched_whole = [k for k in keywords if k in found_whole]
+
+        summary, style, sentiment, sentiment_text = classify_description(desc, cues)
+        is_viral = views > subs
+        adjusted_subs = subs
+        # Adjust subscriber count based on thresholds
+        if subs < 500:
+            adjusted_subs = subs * 6.0
+        elif subs < 1000:
+            adjusted_subs = subs * 4.0
+        elif subs < 2500:
+            adjusted_subs = subs * 3.0
+        elif subs < 5000:
+            adjusted_subs = subs * 2.0
+        elif subs < 10000:
+            adjusted_subs = subs * 1.7
+        elif subs < 20000:
+            adjusted_subs = subs * 1.5
+        elif subs < 50000:
+            adjusted_subs = subs * 0.90
+        elif subs < 100000:
+            adjusted_subs = subs * 0.80
+        elif subs < 500000:
+            adjusted_subs = subs * 0.75
+        elif subs < 1000000:
+            adjusted_subs = subs * 0.40
         else:
-            style = "entertaining"
-        return desc[:200], style, sentiment_score, sentiment_text
+            adjusted_subs = subs * 0.35
+
+        viral_score = round(views / adjusted_subs, 2) if adjusted_subs > 0 else 0
+
+        all_results.append({
+            'Topic': video_niches.get(video['id'], topic),
+            'Title': snippet['title'],
+            'Channel': snippet['channelTitle'],
+            'Subscribers': subs,
+            'Views': views,
+            'Likes': likes,
+            'Comments': comments,
+            'Duration (min)': round(duration or 0, 2),
+            'Published': snippet['publishedAt'],
+            'Link': f"https://www.youtube.com/watch?v={video['id']}",
+            'Summary': summary,
+            'Style': style,
+            'Sentiment Score': sentiment,
+            'Sentiment Text': sentiment_text,
+            'Thumbnail': snippet['thumbnails']['medium']['url'],
+            'Viral': is_viral,
+            'Viral Score': viral_score,
+            'Matched Keyword': ", ".join(matched) or topic,
+            'Avatar': avatar_url,
+            'Language': snippet.get('defaultAudioLanguage', 'en')[:2].lower(),
+            'Keyword Hits': len(matched),
+            'Keyword Count': len(keywords),
+            'Matched Keyword (word)': ", ".join(matched_whole) or topic,
+            'Keyword Hits (word)': len(matched_whole),
+            'Duration Known': duration is not None,
+            'Views/Day': growth.get(video['id'], 0.0),
+        })
+
+    return all_results
+
+
+def research_job(job, youtube_key, topic, months_back, max_results, search_mode):
+    """Background research run: search, then fetch and enrich in batches of 50, streaming rows into the job."""
+    service = youtube_service(youtube_key)
+    published_after = (datetime.now(timezone.utc) - timedelta(days=30 * months_back)).isoformat("T")
+    keywords = [k.strip().lower() for k in topic.split('|') if k.strip()]
+    if search_mode.startswith("Fan-out") and keywords:
+        video_niches = fan_out_search(youtube_key, keywords, published_after, max_results, job)
+    else:
+        search_results = search_videos(service, topic, published_after, max_results, job)
+        video_niches = {item['id']['videoId']: topic for item in search_results}
+    snapshot_store.track(topic, video_niches)
+    research_jobs.report(job, videos_found=len(video_niches))
+
+    video_ids = list(video_niches)
+    for i in range(0, len(video_ids), 50):
+        if research_jobs.cancelled(job):
+            return
+        videos = get_video_details(service, video_ids[i:i+50])
+        snapshot_store.save_videos(videos)
+        rows = enrich_videos(service, videos, video_niches, topic, keywords)
+        research_jobs.add_rows(job, rows)
+        title_index.add_titles(topic, rows)
+        research_jobs.report(job, rows_enriched=len(videos))
+
+
+def refresh_job(job, youtube_key, topic, stale_hours):
+    """Background refresh of a tracked topic: re-query stale stats only, then rebuild rows from the store."""
+    service = youtube_service(youtube_key)
+    keywords = [k.strip().lower() for k in topic.split('|') if k.strip()]
+    video_niches = snapshot_store.tracked_videos(topic)
+    refreshed = refresh_stats(service, list(video_niches), stale_hours)
+    research_jobs.report(job, videos_found=len(video_niches), stats_refreshed=refreshed)
+    video_ids = list(video_niches)
+    for i in range(0, len(video_ids), 50):
+        if research_jobs.cancelled(job):
+            return
+        videos = snapshot_store.load_videos(video_ids[i:i+50])
+        rows = enrich_videos(service, videos, video_niches, topic, keywords)
+        research_jobs.add_rows(job, rows)
+        title_index.add_titles(topic, rows)
+        research_jobs.report(job, rows_enriched=len(videos))
 
-    def parse_duration(iso_duration):
-        try:
-            duration = isodate.parse_duration(iso_duration)
-            return duration.total_seconds() / 60
-        except:
-            return None
+
+def run():
+    youtube_key = st.secrets["api"]["youtube_key"]
+    client = OpenAI(api_key=st.secrets["api"]["openai_key"])
 
     def render_viral_badge(score):
         percentage = min(score, 1.5)
@@ -109,7 +369,7 @@ def run():
         """
         return svg
 
-    def generate_video_insight(row):
+    def generate_video_insight(row, similar=()):
         prompt = f"""
 You're a YouTube growth strategist. Analyze this video to identify repeatable, audience-agnostic techniques that may have contributed to its strong performance.
 
@@ -131,6 +391,10 @@ Also explain **when NOT to use** any tactic mentioned (e.g. "only works if..." o
 - Comments: {row['Comments']}
 - Duration: {row['Duration (min)']} min
 - Keyword Match: {row['Matched Keyword']}"""
+        if similar:
+            # One insight covers the whole cluster, so tell the model what the group has in common
+            prompt += "\n\n**Similar videos in this group** (reuploads, series episodes or the same format):\n"
+            prompt += "\n".join(f"- {title}" for title, _ in similar[:10])
 
         try:
             response = client.chat.completions.create(
@@ -146,6 +410,100 @@ Also explain **when NOT to use** any tactic mentioned (e.g. "only works if..." o
         except Exception as e:
             return f"Insight generation failed: {str(e)}"
 
+    @st.fragment
+    def render_result_card(i, row, similar=()):
+        # Each card is its own fragment, so its buttons only rerun and redraw this card
+        with st.container():
+            st.markdown(f"### 🔥 [{row['Title']}]({row['Link']})")
+            cols = st.columns([1], gap="small")
+            with cols[0]:
+                st.markdown("""
+    <div style='display: flex; align-items: flex-start; gap: 16px;'>
+        <img src='""" + row['Thumbnail'] + """' width='200'/>
+        <div style='text-align: center;'>
+            <img src='""" + row['Avatar'] + """' width='100'/><br>
+            <div style='font-size: 16px; font-weight: 600; text-align: center;'>""" + row['Channel'] + """</div>
+        </div>
+        <div>""" + render_viral_badge(row['Viral Score']) + """</div>
+    </div>
+    """, unsafe_allow_html=True)
+                    
+                    
+            # Already shown above; remove duplicate badge
+            # st.markdown(badge_svg, unsafe_allow_html=True)
+            st.markdown(f"**Subscribers**: {row['Subscribers']} | **Views**: {row['Views']} | **Likes**: {row['Likes']} | **Comments**: {row['Comments']}  ")
+            st.markdown(f"**Duration**: {row['Duration (min)']} min | **Published**: {row['Published']} | **Views/Day**: {row['Views/Day']}")
+            st.markdown(f"**Style**: {row['Style']} | **Sentiment**: {row['Sentiment Text']} ({row['Sentiment Score']:.2f})")
+            st.markdown(f"**Summary**: {row['Summary']}")
+            st.markdown(f"**Matched Keyword**: _{row['Matched Keyword']}_")
+
+            if similar:
+                with st.expander(f"🧬 +{len(similar)} similar videos"):
+                    st.markdown("\n".join(f"- [{title}]({link})" for title, link in similar))
+
+            # Insights are kept per cluster so similar videos share one call and full reruns don't drop them
+            insights = st.session_state.setdefault('insights', {})
+            if st.button(f"🧠 Why did this go viral?", key=f"insight_{i}"):
+                insights[row['Cluster Key']] = generate_video_insight(row, similar)
+            if row['Cluster Key'] in insights:
+                st.markdown("---")
+                st.image(row['Thumbnail'], width=320)
+                st.markdown(f"### [{row['Title']}]({row['Link']})")
+                st.info(insights[row['Cluster Key']])
+                st.markdown("---")
+
+            packages = st.session_state.setdefault('packages', {})
+            if st.button(f"📦 Build package", key=f"package_{i}"):
+                with st.expander("📦 Video package", expanded=True):
+                    packages[row['Link']] = package_builder.build_package(row)
+            elif row['Link'] in packages:
+                with st.expander("📦 Video package", expanded=True):
+                    package_builder.render_package(packages[row['Link']])
+
+    def start_job(fn, *args, fetch_key, label):
+        job_id = research_jobs.submit(fn, *args, label=label)
+        st.session_state['research_job'] = job_id
+        st.session_state['research_job_key'] = fetch_key
+        st.session_state.setdefault('research_job_ids', []).append(job_id)
+        st.session_state.setdefault('research_job_keys', {})[job_id] = fetch_key
+
+    def load_job_results(job):
+        st.session_state['results_raw'] = clustering.assign_clusters(pd.DataFrame(job['rows']))
+        st.session_state['results_job'] = job['id']
+        # Only a complete run counts as fetched; a cancelled one can be re-run with the same terms
+        if job['status'] == "done":
+            st.session_state['results_fetch_key'] = st.session_state.get('research_job_keys', {}).get(job['id'])
+        else:
+            st.session_state['results_fetch_key'] = None
+
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def job_panel(filters, sort_by, ascending, top_k):
+        # Polls the running job without rerunning the rest of the page
+        job = research_jobs.get(st.session_state.get('research_job'))
+        if job is None:
+            st.session_state.pop('research_job', None)
+            st.rerun()
+        progress = job['progress']
+        if job['status'] in ("queued", "running"):
+            partial = query_results(pd.DataFrame(job['rows']), filters, sort_by, ascending, top_k)
+            st.info(
+                f"🔄 {job['label']} — {job['status']}: {progress.get('pages', 0)} pages fetched, "
+                f"{progress.get('rows_enriched', 0)}/{progress.get('videos_found', '?')} rows enriched, "
+                f"{len(partial)} rows kept"
+            )
+            if not partial.empty:
+                st.dataframe(partial[['Title', 'Channel', 'Views', 'Viral Score', 'Views/Day']], hide_index=True)
+            if st.button("✖️ Cancel research", key="cancel_job"):
+                research_jobs.cancel(job['id'])
+            return
+        # Finished: hand the rows to the page and stop polling
+        st.session_state.pop('research_job', None)
+        if job['status'] == "failed":
+            st.error(f"❌ Research failed: {job['error']}")
+            return
+        load_job_results(job)
+        st.rerun()
+
     st.title("📊 Topic Researcher")
     st.markdown("""
     Step 1 of the Creator Toolkit
@@ -190,8 +548,9 @@ Also explain **when NOT to use** any tactic mentioned (e.g. "only works if..." o
         else:
             dur_min, dur_max = 0, 240
 
-        sort_by = st.selectbox("Sort results by:", ["Viral Score", "Views", "Likes", "Comments", "Subscribers"], index=0)
+        sort_by = st.selectbox("Sort results by:", ["Viral Score", "Views/Day", "Views", "Likes", "Comments", "Subscribers"], index=0)
         sort_order = st.radio("Sort order:", ["Descending", "Ascending"], horizontal=True)
+        top_k = st.slider("Keep top results (by sort order):", 10, 500, 100)
 
         language_options = {
             "English": "en", "Spanish": "es", "German": "de", "French": "fr", "Portuguese": "pt",
@@ -201,112 +560,74 @@ Also explain **when NOT to use** any tactic mentioned (e.g. "only works if..." o
         language_filter = language_options[language_label]
 
         match_mode = st.radio("Niche match mode:", ["Loose (any keyword)", "Strict (all keywords)"], horizontal=True)
+        whole_words = st.checkbox("Match whole words only", value=False)
+        group_similar = st.checkbox("Group similar videos (reuploads, series, same format)", value=True)
+        search_mode = st.radio("Search mode:", ["Fan-out (search each niche)", "Combined (single query)"], horizontal=True)
 
         creator_filter = st.text_input("From specific creators? (optional, comma-separated names)", "")
-        search_clicked = st.button("🔍 Find Videos")
-
-    if search_clicked:
-        st.info("🔄 Searching YouTube and analyzing results...")
-        published_after = (datetime.now(timezone.utc) - timedelta(days=30 * months_back)).isoformat("T")
+        stale_hours = st.slider("Refresh stats older than (hours):", 1, 168, 24)
+        button_cols = st.columns([1, 1, 3])
+        search_clicked = button_cols[0].button("🔍 Find Videos")
+        refresh_clicked = button_cols[1].button("♻️ Refresh tracked niche")
+
+    fetch_key = (niches.strip(), months_back, max_results, search_mode)
+    filters = {
+        'language': language_filter.lower(),
+        'shorts': shorts_toggle,
+        'strict': match_mode == "Strict (all keywords)",
+        'whole_words': whole_words,
+        'Subscribers': (subs_min, subs_max),
+        'Views': (views_min, views_max),
+        'Likes': (likes_min, likes_max),
+        'Comments': (comments_min, comments_max),
+        'Duration (min)': (dur_min, dur_max),
+    }
+    active_job = st.session_state.get('research_job')
+
+    if refresh_clicked and not active_job:
         topic = niches.strip()
-        search_results = search_videos(topic, published_after, max_results)
-        video_ids = [item['id']['videoId'] for item in search_results]
-        videos = get_video_details(video_ids)
-
-        all_results = []
-        for video in videos:
-            snippet = video['snippet']
-            # creator_names = [name.strip().lower() for name in creator_filter.split(',') if name.strip()]
-            # if creator_names and snippet['channelTitle'].lower() not in creator_names:
-            #     continue
-            if snippet.get('defaultAudioLanguage', 'en')[:2] != language_filter.lower():
-                continue
-
-            stats = video['statistics']
-            content = video.get('contentDetails', {})
-            views = int(stats.get('viewCount', 0))
-            likes = int(stats.get('likeCount', 0))
-            comments = int(stats.get('commentCount', 0))
-            duration = parse_duration(content.get('duration', 'PT0M'))
-
-            if shorts_toggle == "Shorts only" and (duration is None or duration > 2.0):
-                continue
-            if shorts_toggle == "Exclude Shorts" and (duration is not None and duration <= 2.0):
-                continue
-
-            channel_id = snippet['channelId']
-            subs, channel_description, avatar_url = get_channel_info(channel_id)
-            desc = snippet.get('description', '')
-            combined_text = f"{snippet['title']} {desc} {channel_description}".lower()
-            keywords = [k.strip().lower() for k in topic.split('|')]
-
-            if match_mode == "Strict (all keywords)" and not all(keyword in combined_text for keyword in keywords):
-                continue
-
-            summary, style, sentiment, sentiment_text = classify_description(desc)
-            is_viral = views > subs
-            adjusted_subs = subs
-            # Adjust subscriber count based on thresholds
-            if subs < 500:
-                adjusted_subs = subs * 6.0
-            elif subs < 1000:
-                adjusted_subs = subs * 4.0
-            elif subs < 2500:
-                adjusted_subs = subs * 3.0
-            elif subs < 5000:
-                adjusted_subs = subs * 2.0
-            elif subs < 10000:
-                adjusted_subs = subs * 1.7
-            elif subs < 20000:
-                adjusted_subs = subs * 1.5
-            elif subs < 50000:
-                adjusted_subs = subs * 0.90
-            elif subs < 100000:
-                adjusted_subs = subs * 0.80
-            elif subs < 500000:
-                adjusted_subs = subs * 0.75
-            elif subs < 1000000:
-                adjusted_subs = subs * 0.40
-            else:
-                adjusted_subs = subs * 0.35
-
-            viral_score = round(views / adjusted_subs, 2) if adjusted_subs > 0 else 0
-
-            if subs < subs_min or subs > subs_max:
-                continue
-            if views < views_min or views > views_max:
-                continue
-            if likes < likes_min or likes > likes_max:
-                continue
-            if comments < comments_min or comments > comments_max:
-                continue
-            if duration is not None and (duration < dur_min or duration > dur_max):
-                continue
-
-            all_results.append({
-                'Topic': topic,
-                'Title': snippet['title'],
-                'Channel': snippet['channelTitle'],
-                'Subscribers': subs,
-                'Views': views,
-                'Likes': likes,
-                'Comments': comments,
-                'Duration (min)': round(duration or 0, 2),
-                'Published': snippet['publishedAt'],
-                'Link': f"https://www.youtube.com/watch?v={video['id']}",
-                'Summary': summary,
-                'Style': style,
-                'Sentiment Score': sentiment,
-                'Sentiment Text': sentiment_text,
-                'Thumbnail': snippet['thumbnails']['medium']['url'],
-                'Viral': is_viral,
-                'Viral Score': viral_score,
-                'Matched Keyword': ", ".join([k for k in keywords if k in combined_text]) or topic,
-                'Avatar': avatar_url
-            })
-
-        df = pd.DataFrame(all_results)
-        st.session_state['results_df'] = df
+        if not snapshot_store.tracked_videos(topic):
+            st.warning("This niche isn't tracked yet — run 🔍 Find Videos once to start tracking it.")
+        else:
+            # Refreshed rows are every video ever tracked for the topic, whatever the date window or
+            # search mode, so they get their own key and never stand in for a 🔍 Find Videos fetch
+            start_job(refresh_job, youtube_key, topic, stale_hours, fetch_key=("refresh", topic), label=f"♻️ {topic}")
+    if search_clicked and not active_job and st.session_state.get('results_fetch_key') != fetch_key:
+        topic = niches.strip()
+        start_job(research_job, youtube_key, topic, months_back, max_results, search_mode, fetch_key=fetch_key, label=f"🔍 {topic}")
+    elif search_clicked and not active_job:
+        st.info("ℹ️ The results below already cover these search terms and date window — change a filter to re-query them, or change the search to fetch again.")
+    if (search_clicked or refresh_clicked) and active_job:
+        st.info("ℹ️ A research run is already in progress — wait for it to finish or cancel it below before starting another.")
+
+    if st.session_state.get('research_job'):
+        job_panel(filters, sort_by, sort_order == "Ascending", top_k)
+
+    recent_jobs = [job for job in map(research_jobs.get, st.session_state.get('research_job_ids', [])) if job]
+    finished_jobs = [job for job in recent_jobs if job['status'] != 'running' and job['status'] != 'queued']
+    if finished_jobs:
+        with st.expander("🗂️ Recent research runs"):
+            for job in reversed(finished_jobs):
+                cols = st.columns([4, 1])
+                age_min = int((time.time() - job['finished']) / 60)
+                cols[0].markdown(f"{job['label']} — _{job['status']}_, {len(job['rows'])} videos, finished {age_min} min ago")
+                if cols[1].button("Load", key=f"load_job_{job['id']}"):
+                    load_job_results(job)
+                    st.rerun()
+
+    if 'results_raw' in st.session_state:
+        if st.session_state['results_fetch_key'] == ("refresh", niches.strip()):
+            st.caption("Showing every tracked video for this niche with refreshed stats — click 🔍 Find Videos to search the selected date window.")
+        elif st.session_state['results_fetch_key'] != fetch_key:
+            st.caption("Search terms or date window changed — click 🔍 Find Videos to fetch new results. Filters below apply to the last fetch.")
+        # Analytics describe every matching video; the cards below only show the top-K of them
+        st.session_state['results_filtered'] = filter_results(st.session_state['results_raw'], filters)
+        st.session_state['results_df'] = top_results(
+            st.session_state['results_filtered'],
+            sort_by,
+            sort_order == "Ascending",
+            top_k,
+        )
 
     if 'results_df' in st.session_state:
         df = st.session_state['results_df']
@@ -315,37 +636,35 @@ Also explain **when NOT to use** any tactic mentioned (e.g. "only works if..." o
         else:
             st.success(f"✅ Found {len(df)} videos matching your criteria.")
 
-            for i, row in df.iterrows():
-                with st.container():
-                    st.markdown(f"### 🔥 [{row['Title']}]({row['Link']})")
-                    cols = st.columns([1], gap="small")
-                    with cols[0]:
-                        st.markdown("""
-    <div style='display: flex; align-items: flex-start; gap: 16px;'>
-        <img src='""" + row['Thumbnail'] + """' width='200'/>
-        <div style='text-align: center;'>
-            <img src='""" + row['Avatar'] + """' width='100'/><br>
-            <div style='font-size: 16px; font-weight: 600; text-align: center;'>""" + row['Channel'] + """</div>
-        </div>
-        <div>""" + render_viral_badge(row['Viral Score']) + """</div>
-    </div>
-    """, unsafe_allow_html=True)
-                    
-                    
-                    # Already shown above; remove duplicate badge
-                    # st.markdown(badge_svg, unsafe_allow_html=True)
-                    st.markdown(f"**Subscribers**: {row['Subscribers']} | **Views**: {row['Views']} | **Likes**: {row['Likes']} | **Comments**: {row['Comments']}  ")
-                    st.markdown(f"**Duration**: {row['Duration (min)']} min | **Published**: {row['Published']}")
-                    st.markdown(f"**Style**: {row['Style']} | **Sentiment**: {row['Sentiment Text']} ({row['Sentiment Score']:.2f})")
-                    st.markdown(f"**Summary**: {row['Summary']}")
-                    st.markdown(f"**Matched Keyword**: _{row['Matched Keyword']}_")
-
-                    if st.button(f"🧠 Why did this go viral?", key=f"insight_{i}"):
-                        st.markdown("---")
-                        st.image(row['Thumbnail'], width=320)
-                        st.markdown(f"### [{row['Title']}]({row['Link']})")
-                        insights = generate_video_insight(row)
-                        st.info(insights)
-                        st.markdown("---")
-
-
+            # The first video of each cluster in the current sort order represents it
+            similar = {key: list(zip(group['Title'], group['Link']))[1:] for key, group in df.groupby('Cluster Key', sort=False)}
+            shown = df.drop_duplicates('Cluster Key') if group_similar else df
+            if group_similar and len(shown) < len(df):
+                st.caption(f"🧬 Grouped into {len(shown)} clusters of similar videos.")
+
+            if st.toggle("📊 Show niche analytics", key="show_analytics"):
+                analytics_key = (st.session_state.get('results_job'), repr(filters))
+                niche_analytics.render_analytics(st.session_state['results_filtered'], analytics_key)
+
+            thumb_analysis = st.session_state.get('thumbnail_hints')
+            if st.button(f"🖼️ Analyse thumbnails ({min(len(df), thumbnail_analysis.MAX_THUMBNAILS)})"):
+                with st.spinner("Downloading and analysing thumbnails..."):
+                    thumb_analysis = thumbnail_analysis.analyse_results(df, niches.strip())
+                if thumb_analysis is None:
+                    st.warning("Couldn't download any thumbnails for these results.")
+            if thumb_analysis:
+                with st.expander("🖼️ Thumbnail analysis", expanded=True):
+                    thumbnail_analysis.render_analysis(thumb_analysis)
+                    st.caption("These hints are passed to the 🎨 Thumbnail Helper.")
+
+            insights = st.session_state.setdefault('insights', {})
+            missing = [row for _, row in shown.drop_duplicates('Cluster Key').iterrows() if row['Cluster Key'] not in insights]
+            if missing and st.button(f"🧠 Explain all {len(missing)} clusters"):
+                with st.spinner(f"Generating {len(missing)} insights..."):
+                    with ThreadPoolExecutor(max_workers=4) as pool:
+                        explained = pool.map(lambda row: generate_video_insight(row, similar[row['Cluster Key']]), missing)
+                        for row, insight in zip(missing, explained):
+                            insights[row['Cluster Key']] = insight
+
+            for i, row in shown.iterrows():
+                render_result_card(i, row, similar[row['Cluster Key']] if group_similar else ())